@@ -5,20 +5,62 @@
 通用数据下载程序 - 支持所有AKShare数据类型
 """
 
-import json
-import akshare as ak
+import argparse
+import asyncio
 import pandas as pd
 import os
 import sys
 from datetime import datetime
 import time
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.common import (
+    FILE_EXTENSIONS, build_default_params, dump_json_records,
+    is_fresh, load_json, pooled_requests, resolve_ak_function, run_async,
+    write_dataframe
+)
+from src.utils.rate_limiter import AsyncTokenBucket
+
+DATA_TYPES = ('macro', 'stock', 'bond', 'futures', 'fund_public', 'fund_private', 'index', 'qdii')
+
+@dataclass(slots=True)
+class TaskResult:
+    """单个任务的下载结果，只保存状态字段，任务本身通过task_idx引用"""
+    task_idx: int
+    status: str = 'pending'
+    file_path: Optional[str] = None
+    data_size: int = 0
+    execution_time: float = 0
+    error: Optional[str] = None
 
 class DataDownloader:
+    # 下载状态按列存储(SoA)的列名，报告中追加在任务配置字段之后
+    RESULT_COLUMNS = ('status', 'file_path', 'error', 'execution_time', 'data_size')
+    
     def __init__(self, config_file: str = "result/all_data_tasks.json", 
-                 data_dir: str = "result/data"):
+                 data_dir: str = "result/data", max_concurrency: int = 8,
+                 rate_limit: float = 5.0, prefix_rate_limit: float = 2.0,
+                 file_format: str = 'csv', incremental: bool = False,
+                 io_workers: int = 4):
         self.config_file = config_file
         self.data_dir = data_dir
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.prefix_rate_limit = prefix_rate_limit
+        if file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"不支持的文件格式: {file_format}，可选: {list(FILE_EXTENSIONS)}")
+        self.file_ext = FILE_EXTENSIONS[file_format]
+        self.incremental = incremental
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers)
+        self.tasks = []
+        self.results = {col: [] for col in self.RESULT_COLUMNS}
+        self._dir_cache = {}
         self.setup_logging()
         self.create_data_directory()
         
@@ -35,103 +77,148 @@ class DataDownloader:
         )
         self.logger = logging.getLogger(__name__)
     
-    def create_data_directory(self):
-        """创建按类型分类的数据目录"""
-        for data_type in ['macro', 'stock', 'bond', 'futures', 'fund_public', 'fund_private', 'index', 'qdii']:
-            os.makedirs(os.path.join(self.data_dir, data_type), exist_ok=True)
+    def create_data_directory(self, data_types=DATA_TYPES):
+        """创建按类型分类的数据目录，每个目录只创建一次并缓存其路径"""
+        for data_type in set(data_types) - self._dir_cache.keys():
+            path = os.path.join(self.data_dir, data_type)
+            os.makedirs(path, exist_ok=True)
+            self._dir_cache[data_type] = path
+    
+    def _init_limiters(self):
+        """初始化全局及按接口前缀分组的令牌桶（需在事件循环内创建）"""
+        self.limiter = AsyncTokenBucket(self.rate_limit)
+        self._prefix_limiters = defaultdict(lambda: AsyncTokenBucket(self.prefix_rate_limit))
     
     def load_config(self) -> list:
         """加载任务配置"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json(self.config_file)
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {e}")
             sys.exit(1)
     
-    def download_data(self, task: dict, max_retries: int = 3) -> dict:
-        """下载单个接口数据"""
-        result = task.copy()
-        result.update({
-            'status': 'pending',
-            'file_path': None,
-            'error': None,
-            'execution_time': 0
-        })
+    def fetch_data(self, task: dict) -> pd.DataFrame:
+        """调用AKShare接口获取数据并校验"""
+        ak_func = resolve_ak_function(task['func_name'])
+        
+        # 处理特殊参数
+        params = build_default_params(task.get('func_params', {}))
+        
+        df = ak_func(**params)
+        
+        # 验证数据
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            raise ValueError("无效数据格式")
+        return df
+    
+    async def download_data(self, task: dict, index: int, total: int,
+                            sem: asyncio.Semaphore) -> TaskResult:
+        """下载单个接口数据
+
+        AKShare为同步接口，在并发上限和限流内放入线程执行；写文件在释放
+        并发名额后交给IO线程池，事件循环可继续调度其他请求。
+        """
+        result = TaskResult(task_idx=index - 1)
+        file_path = self._output_path(task)
+        
+        # 增量模式: 文件仍在更新周期内则跳过
+        if self.incremental and is_fresh(file_path, task.get('frequency', 'daily')):
+            result.status = 'skipped'
+            result.file_path = file_path
+            self.logger.info(f"- {task['func_name']} 未过期，跳过")
+            return result
         
         try:
-            ak_func = getattr(ak, task['func_name'])
-            start_time = time.time()
-            
-            # 处理特殊参数
-            params = {}
-            for param in task.get('func_params', {}):
-                if task['func_params'][param] == 'string':
-                    params[param] = "北京"  # 默认值
-            
-            df = ak_func(**params) if params else ak_func()
-            
-            # 验证数据
-            if not isinstance(df, pd.DataFrame) or df.empty:
-                raise ValueError("无效数据格式")
+            async with sem:
+                self.logger.info(f"[{index}/{total}] 处理: {task['func_name']}")
+                start_time = time.time()
+                prefix = task['func_name'].split('_')[0]
+                async with self.limiter, self._prefix_limiters[prefix]:
+                    df = await asyncio.to_thread(self.fetch_data, task)
             
             # 按数据类型存储
-            data_type_dir = os.path.join(self.data_dir, task['data_type'])
-            csv_path = os.path.join(data_type_dir, f"{task['func_name']}.csv")
-            df.to_csv(csv_path, index=False)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._io_pool, write_dataframe, df, file_path)
             
-            result.update({
-                'status': 'success',
-                'file_path': csv_path,
-                'data_size': len(df),
-                'execution_time': round(time.time() - start_time, 3)
-            })
+            result.status = 'success'
+            result.file_path = file_path
+            result.data_size = len(df)
+            result.execution_time = round(time.time() - start_time, 3)
             self.logger.info(f"✓ {task['func_name']} 下载成功")
             
         except Exception as e:
-            result.update({
-                'status': 'error',
-                'error': str(e)
-            })
+            result.status = 'error'
+            result.error = str(e)
             self.logger.error(f"✗ {task['func_name']} 下载失败: {e}")
         
         return result
     
-    def run(self):
-        """执行下载任务"""
-        tasks = self.load_config()
+    def _output_path(self, task: dict) -> str:
+        """任务的输出文件路径: 数据类型目录/函数名.扩展名"""
+        return f"{self._dir_cache[task['data_type']]}{os.sep}{task['func_name']}{self.file_ext}"
+    
+    def _store_result(self, idx: int, result: TaskResult):
+        """将单个任务结果写入预分配的结果列"""
+        for col in self.RESULT_COLUMNS:
+            self.results[col][idx] = getattr(result, col)
+    
+    async def _run_async(self):
+        """并发执行所有下载任务"""
+        tasks = self.tasks = self.load_config()
         total = len(tasks)
-        results = []
+        self.results = {col: [None] * total for col in self.RESULT_COLUMNS}
+        self.create_data_directory(task['data_type'] for task in tasks)
+        sem = asyncio.Semaphore(self.max_concurrency)
+        self._init_limiters()
         
-        self.logger.info(f"开始下载 {total} 个数据接口...")
+        self.logger.info(f"开始下载 {total} 个数据接口 (并发数: {self.max_concurrency})...")
         
-        for i, task in enumerate(tasks, 1):
-            self.logger.info(f"[{i}/{total}] 处理: {task['func_name']}")
-            result = self.download_data(task)
-            results.append(result)
-            time.sleep(0.5)  # 请求间隔
-            
-        self.generate_report(results)
+        # 输出到同一文件的任务只下载一次，结果回填到每个重复任务；
+        # 文件名不含参数，参数不同的同名任务也会写同一文件，故以输出路径去重避免并发写入
+        keys = [self._output_path(task) for task in tasks]
+        downloads = {}
+        for i, (task, key) in enumerate(zip(tasks, keys), 1):
+            if key not in downloads:
+                downloads[key] = asyncio.create_task(self.download_data(task, i, total, sem))
+        if len(downloads) < total:
+            self.logger.info(f"跳过 {total - len(downloads)} 个输出到相同文件的重复任务")
+        
+        await asyncio.gather(*downloads.values())
+        for idx, key in enumerate(keys):
+            self._store_result(idx, downloads[key].result())
+    
+    def run(self):
+        """执行下载任务"""
+        with pooled_requests():
+            run_async(self._run_async())
+        self.generate_report()
     
-    def generate_report(self, results: list):
-        """生成下载报告"""
+    def generate_report(self):
+        """生成下载报告（明细逐条写入文件）"""
+        statuses = self.results['status']
+        columns = [self.results[col] for col in self.RESULT_COLUMNS]
         stats = {
             'timestamp': datetime.now().isoformat(),
-            'total': len(results),
-            'success': sum(1 for r in results if r['status'] == 'success'),
-            'failed': sum(1 for r in results if r['status'] == 'error'),
-            'details': results
+            'total': len(statuses),
+            'success': statuses.count('success'),
+            'failed': statuses.count('error'),
+            'skipped': statuses.count('skipped'),
         }
+        # 明细 = 任务配置字段 + 下载状态字段
+        details = ({**task, **dict(zip(self.RESULT_COLUMNS, row))} for task, row in zip(self.tasks, zip(*columns)))
         
         report_path = os.path.join('result', 'download_report.json')
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        dump_json_records(stats, 'details', details, report_path)
         
         self.logger.info(f"报告已保存: {report_path}")
-        print(f"\n下载完成! 成功: {stats['success']}, 失败: {stats['failed']}")
+        print(f"\n下载完成! 成功: {stats['success']}, 失败: {stats['failed']}, 跳过: {stats['skipped']}")
 
 if __name__ == "__main__":
-    downloader = DataDownloader()
+    arg_parser = argparse.ArgumentParser(description='通用数据下载程序')
+    arg_parser.add_argument('--incremental', action='store_true', help='跳过更新周期内已下载的数据')
+    args = arg_parser.parse_args()
+    
+    downloader = DataDownloader(incremental=args.incremental)
     try:
         downloader.run()
     except KeyboardInterrupt:
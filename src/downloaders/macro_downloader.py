@@ -1,20 +1,60 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import json
-import akshare as ak
+import argparse
+import asyncio
+import functools
 import pandas as pd
 import os
 import sys
 from datetime import datetime
 import time
-from typing import Dict, Any, List
+import random
+from typing import Dict, Any, List, Optional
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.common import (
+    FILE_EXTENSIONS, build_default_params, dump_json_records,
+    is_fresh, load_json, pooled_requests, resolve_ak_function, run_async,
+    write_dataframe
+)
+from src.utils.rate_limiter import AsyncTokenBucket
+
+def _release_when_done(sem: asyncio.Semaphore, fetch: asyncio.Future):
+    """被放弃的接口调用结束后释放并发名额，并取出其异常以免产生未检索异常的警告"""
+    if not fetch.cancelled():
+        fetch.exception()
+    sem.release()
 
 class MacroDataDownloader:
-    def __init__(self, config_file: str = "result/macro_tasks.json", data_dir: str = "result/data"):
+    # 已知有问题、需要手动处理的数据源
+    PROBLEM_SOURCES = frozenset({
+        'macro_china_shrzgm', 'macro_china_central_bank_balance',
+        'macro_china_insurance', 'macro_china_supply_of_money',
+        'macro_china_swap_rate', 'macro_china_foreign_exchange_gold',
+        'macro_china_retail_price_index', 'macro_china_nbs_nation',
+        'macro_china_nbs_region'
+    })
+    PROBLEM_NOTE = "此数据源存在问题，需要手动处理\n\n错误详情:\n无详细错误信息"
+    
+    def __init__(self, config_file: str = "result/macro_tasks.json", data_dir: str = "result/data",
+                 max_concurrency: int = 8, rate_limit: float = 5.0,
+                 prefix_rate_limit: float = 2.0, file_format: str = 'csv',
+                 incremental: bool = False, io_workers: int = 4):
         self.config_file = config_file
         self.data_dir = data_dir
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+        self.prefix_rate_limit = prefix_rate_limit
+        if file_format not in FILE_EXTENSIONS:
+            raise ValueError(f"不支持的文件格式: {file_format}，可选: {list(FILE_EXTENSIONS)}")
+        self.file_ext = FILE_EXTENSIONS[file_format]
+        self.incremental = incremental
+        self._io_pool = ThreadPoolExecutor(max_workers=io_workers)
         self.setup_logging()
         self.create_data_directory()
         
@@ -39,17 +79,63 @@ class MacroDataDownloader:
             os.makedirs(self.data_dir)
             self.logger.info(f"创建数据目录: {self.data_dir}")
     
+    def _init_limiters(self):
+        """初始化全局及按接口前缀分组的令牌桶（需在事件循环内创建）"""
+        self.limiter = AsyncTokenBucket(self.rate_limit)
+        self._prefix_limiters = defaultdict(lambda: AsyncTokenBucket(self.prefix_rate_limit))
+    
+    def _output_path(self, config: Dict) -> str:
+        """接口配置的输出文件路径: 数据目录/名称.扩展名"""
+        return os.path.join(self.data_dir, f"{config['name']}{self.file_ext}")
+    
     def load_config(self) -> List[Dict]:
         """加载配置文件"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json(self.config_file)
         except Exception as e:
             self.logger.error(f"加载配置文件失败: {e}")
             sys.exit(1)
     
-    def download_interface_data(self, interface_config: Dict) -> Dict[str, Any]:
-        """下载单个接口数据"""
+    def fetch_interface_data(self, interface_config: Dict) -> pd.DataFrame:
+        """调用akshare接口获取数据并校验"""
+        # 获取akshare函数
+        ak_func = resolve_ak_function(interface_config['func_name'])
+        
+        # 调用akshare接口
+        params = build_default_params(interface_config.get('func_params') or {})
+        df = ak_func(**params)
+        
+        # 验证数据
+        if df is None:
+            raise ValueError("返回数据为None")
+        
+        if not isinstance(df, pd.DataFrame):
+            raise ValueError(f"返回数据类型错误: {type(df)}，期望DataFrame")
+        
+        if df.empty:
+            raise ValueError("返回数据为空")
+        
+        return df
+    
+    def save_interface_data(self, name: str, df: pd.DataFrame, file_path: str):
+        """保存数据文件，已知有问题的数据源附加说明文件"""
+        # 保存数据到文件 (默认CSV，可选Parquet/HDF5)
+        write_dataframe(df, file_path)
+        
+        # 对于已知有问题的数据源添加标记
+        if name in self.PROBLEM_SOURCES:
+            with open(os.path.join(self.data_dir, f"{name}_NOTE.txt"), 'w', encoding='utf-8') as f:
+                f.write(self.PROBLEM_NOTE)
+    
+    async def download_interface_data(self, interface_config: Dict,
+                                      sem: asyncio.Semaphore,
+                                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """下载单个接口数据
+
+        AKShare为同步接口，在并发上限和限流内放入线程执行；写文件在释放
+        并发名额后交给IO线程池，事件循环可继续调度其他请求。timeout只限制
+        接口调用本身，不计排队等待并发名额和令牌的时间。
+        """
         name = interface_config['name']
         func_name = interface_config['func_name']
         
@@ -63,56 +149,37 @@ class MacroDataDownloader:
             'execution_time': 0
         }
         
+        file_path = self._output_path(interface_config)
+        
+        # 增量模式: 文件仍在更新周期内则跳过
+        if self.incremental and is_fresh(file_path, interface_config.get('frequency', 'monthly')):
+            result.update({'status': 'skipped', 'file_path': file_path})
+            self.logger.info(f"- {name}: 未过期，跳过")
+            return result
+        
+        start_time = None
         try:
-            # 获取akshare函数
-            ak_func = getattr(ak, func_name, None)
-            if ak_func is None:
-                raise AttributeError(f"akshare中没有找到函数: {func_name}")
-            
-            start_time = time.time()
-            
-            # 调用akshare接口
-            if 'func_params' in interface_config and interface_config['func_params']:
-                params = {}
-                for param_name, param_type in interface_config['func_params'].items():
-                    if param_type == 'string':
-                        params[param_name] = "北京"  # 默认值
-                df = ak_func(**params)
-            else:
-                df = ak_func()
-            
-            execution_time = time.time() - start_time
+            await sem.acquire()
+            fetch = None
+            try:
+                prefix = func_name.split('_')[0]
+                async with self.limiter, self._prefix_limiters[prefix]:
+                    start_time = time.time()
+                    fetch = asyncio.ensure_future(asyncio.to_thread(self.fetch_interface_data, interface_config))
+                    try:
+                        df = await asyncio.wait_for(asyncio.shield(fetch), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        raise TimeoutError(f"下载超时 ({timeout}s)") from None
+                    execution_time = time.time() - start_time
+            finally:
+                if fetch is None or fetch.done():
+                    sem.release()
+                else:
+                    # 超时的调用只是被放弃而非取消：线程无法中断会继续运行，结束前仍占用并发名额
+                    fetch.add_done_callback(functools.partial(_release_when_done, sem))
             
-            # 验证数据
-            if df is None:
-                raise ValueError("返回数据为None")
-            
-            if not isinstance(df, pd.DataFrame):
-                raise ValueError(f"返回数据类型错误: {type(df)}，期望DataFrame")
-            
-            if df.empty:
-                raise ValueError("返回数据为空")
-            
-            # 保存数据到文件 (使用CSV格式)
-            file_name = f"{name}.csv"
-            file_path = os.path.join(self.data_dir, file_name)
-            
-            # 保存为CSV文件
-            df.to_csv(file_path, index=False)
-            
-            # 对于已知有问题的数据源添加标记
-            problem_sources = [
-                'macro_china_shrzgm', 'macro_china_central_bank_balance',
-                'macro_china_insurance', 'macro_china_supply_of_money',
-                'macro_china_swap_rate', 'macro_china_foreign_exchange_gold',
-                'macro_china_retail_price_index', 'macro_china_nbs_nation',
-                'macro_china_nbs_region'
-            ]
-            
-            if name in problem_sources:
-                with open(os.path.join(self.data_dir, f"{name}_NOTE.txt"), 'w') as f:
-                    f.write("此数据源存在问题，需要手动处理\n\n错误详情:\n")
-                    f.write(result.get('error', '无详细错误信息'))
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._io_pool, self.save_interface_data, name, df, file_path)
             
             result.update({
                 'status': 'success',
@@ -124,7 +191,7 @@ class MacroDataDownloader:
             self.logger.info(f"✓ {name}: 成功下载 {len(df)} 行数据 -> {file_path}")
             
         except Exception as e:
-            execution_time = time.time() - start_time if 'start_time' in locals() else 0
+            execution_time = time.time() - start_time if start_time is not None else 0
             result.update({
                 'status': 'error',
                 'error': str(e),
@@ -134,61 +201,98 @@ class MacroDataDownloader:
         
         return result
     
-    def download_all_data(self, max_retries: int = 3, delay: float = 1.0):
-        """下载所有数据"""
+    async def _download_with_retries(self, config: Dict, index: int, total: int,
+                                     sem: asyncio.Semaphore, max_retries: int,
+                                     delay: float, timeout: float,
+                                     max_backoff: float = 30.0) -> Dict[str, Any]:
+        """
+        下载单个接口，失败时按带抖动的指数退避重试（等待期间不占用并发名额）
+        
+        超时的接口调用被放弃而不是取消，其线程仍在后台运行直至结束，重试会再次
+        调用同一接口；被放弃的调用在结束前继续计入并发上限，重试不会无限堆积线程。
+        """
+        self.logger.info(f"[{index}/{total}] 处理接口: {config['name']}")
+        result = None
+        
+        for attempt in range(max_retries):
+            try:
+                result = await self.download_interface_data(config, sem, timeout)
+            except Exception as e:
+                self.logger.error(f"处理接口 {config['name']} 时发生意外错误: {e}")
+                result = {
+                    'name': config['name'],
+                    'func_name': config['func_name'],
+                    'status': 'error',
+                    'file_path': None,
+                    'data_size': 0,
+                    'error': str(e),
+                    'execution_time': 0
+                }
+            
+            if result['status'] in ('success', 'skipped'):
+                break
+            if attempt < max_retries - 1:
+                backoff = min(max_backoff, delay * 2 ** attempt) + random.random() * 0.5
+                self.logger.warning(
+                    f"{config['name']} 第 {attempt + 1} 次尝试失败，{backoff:.1f}s 后重试..."
+                )
+                await asyncio.sleep(backoff)
+            else:
+                self.logger.error(f"接口 {config['name']} 经过 {max_retries} 次尝试仍然失败")
+        
+        return result
+    
+    async def _download_all_async(self, max_retries: int, delay: float,
+                                  timeout: float) -> List[Dict]:
+        """并发下载所有数据"""
         configs = self.load_config()
         total = len(configs)
-        results = []
+        sem = asyncio.Semaphore(self.max_concurrency)
+        self._init_limiters()
         
-        self.logger.info(f"开始下载 {total} 个宏观数据接口...")
+        self.logger.info(f"开始下载 {total} 个宏观数据接口 (并发数: {self.max_concurrency})...")
         
-        for i, config in enumerate(configs, 1):
-            self.logger.info(f"[{i}/{total}] 处理接口: {config['name']}")
-            
-            for attempt in range(max_retries):
-                try:
-                    result = self.download_interface_data(config)
-                    results.append(result)
-                    
-                    if result['status'] == 'success':
-                        break
-                    else:
-                        if attempt < max_retries - 1:
-                            self.logger.warning(f"第 {attempt + 1} 次尝试失败，等待重试...")
-                            time.sleep(delay * (attempt + 1))  # 指数退避
-                        else:
-                            self.logger.error(f"接口 {config['name']} 经过 {max_retries} 次尝试仍然失败")
-                            
-                except Exception as e:
-                    self.logger.error(f"处理接口 {config['name']} 时发生意外错误: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(delay * (attempt + 1))
-            
-            # 接口间延迟，避免请求过于频繁
-            time.sleep(0.5)
+        # 输出到同一文件的配置只下载一次，结果回填到每个重复配置；
+        # 文件名只由名称决定，故以输出路径去重避免并发写入同一文件
+        keys = [self._output_path(config) for config in configs]
+        downloads = {}
+        for i, (config, key) in enumerate(zip(configs, keys), 1):
+            if key not in downloads:
+                downloads[key] = asyncio.create_task(
+                    self._download_with_retries(config, i, total, sem, max_retries, delay, timeout)
+                )
+        if len(downloads) < total:
+            self.logger.info(f"跳过 {total - len(downloads)} 个输出到相同文件的重复配置")
         
-        return results
+        await asyncio.gather(*downloads.values())
+        return [dict(downloads[key].result()) for key in keys]
+    
+    def download_all_data(self, max_retries: int = 3, delay: float = 1.0,
+                          timeout: float = 120.0):
+        """下载所有数据"""
+        with pooled_requests():
+            return run_async(self._download_all_async(max_retries, delay, timeout))
     
     def generate_summary_report(self, results: List[Dict]):
         """生成摘要报告"""
         total = len(results)
         success = sum(1 for r in results if r['status'] == 'success')
-        failed = total - success
+        skipped = sum(1 for r in results if r['status'] == 'skipped')
+        failed = total - success - skipped
         
         summary = {
             'download_time': datetime.now().isoformat(),
             'total_interfaces': total,
             'successful_downloads': success,
             'failed_downloads': failed,
+            'skipped_downloads': skipped,
             'success_rate': success / total if total > 0 else 0,
             'total_data_rows': sum(r.get('data_size', 0) for r in results if r['status'] == 'success'),
-            'details': results
         }
         
-        # 保存摘要报告
+        # 保存摘要报告（明细逐条写入文件）
         report_file = os.path.join(self.data_dir, 'download_summary.json')
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, ensure_ascii=False, indent=2)
+        dump_json_records(summary, 'details', results, report_file)
         
         self.logger.info(f"下载摘要报告已保存: {report_file}")
         
@@ -200,6 +304,7 @@ class MacroDataDownloader:
         print(f"总接口数: {total}")
         print(f"成功下载: {success}")
         print(f"失败: {failed}")
+        print(f"跳过(未过期): {skipped}")
         print(f"成功率: {success/total*100:.1f}%")
         print(f"总数据行数: {summary['total_data_rows']:,}")
         print(f"{'='*60}")
@@ -212,7 +317,11 @@ class MacroDataDownloader:
 
 def main():
     """主函数"""
-    downloader = MacroDataDownloader()
+    arg_parser = argparse.ArgumentParser(description='宏观数据下载程序')
+    arg_parser.add_argument('--incremental', action='store_true', help='跳过更新周期内已下载的数据')
+    args = arg_parser.parse_args()
+    
+    downloader = MacroDataDownloader(incremental=args.incremental)
     
     try:
         results = downloader.download_all_data(max_retries=3, delay=2.0)
@@ -5,10 +5,154 @@
 提供各种字段格式的标准化转换功能
 """
 
+import os
 import re
-from typing import Optional, Union, Dict, Any, Tuple
+import sys
+from functools import lru_cache
+from typing import Optional, Union, Dict, Any, Tuple, Iterable, List, Callable
+from datetime import datetime
 from enum import Enum
 
+try:
+    import pandas as pd
+except ImportError:  # 未安装pandas时只使用手动解析
+    pd = None
+
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.common import load_json_cached
+
+
+# 预编译的正则表达式
+_CN_DATE_RE = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+
+_COMMON_DATETIME_RE = re.compile(
+    r'(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})(?:[ T](\d{1,2}):(\d{1,2})(?::(\d{1,2}))?)?',
+    re.ASCII
+)
+
+# 整列转换时可直接向量化处理的规整格式（其余值逐个转换）
+_PLAIN_FLOAT_PATTERN = r'-?\d+(?:\.\d+)?'
+_ISO_DATE_PATTERN = r'\d{4}-\d{1,2}-\d{1,2}'
+_YYYYMMDD_PATTERN = r'\d{8}'
+_CLEAN_CODE_PATTERN = r'(?:sh|sz|bj|SH|SZ|BJ)?(\d{6})(?:\.?(?:sh|sz|bj|SH|SZ|BJ))?'
+
+# 字段类型 -> 字段名关键词，按判断优先级排列
+_FIELD_TYPE_KEYWORDS = (
+    ('date', ('date', '日期', '时间', 'time')),
+    ('code', ('symbol', 'code', '代码')),
+    ('float', ('price', 'close', 'open', 'high', 'low', 'volume', 'amount', '涨', '跌', '价', '额', '量')),
+)
+
+# 视为空值的字符串（小写），均以n开头且最长4个字符
+_NULL_DATE_STRINGS = frozenset(('nan', 'nat', 'none'))
+_NULL_NUMBER_STRINGS = frozenset(('nan', 'none'))
+
+# 6位代码首位数字 -> 市场
+_FIRST_DIGIT_MARKET = {'6': 'sh', '0': 'sz', '3': 'sz', '8': 'bj', '4': 'bj', '9': 'bj'}
+
+# ASCII字符删除表: 只保留数字 / 只保留数字和 . - ,
+_ASCII_NON_DIGITS = ''.join(chr(c) for c in range(128) if not chr(c).isdigit())
+_DIGIT_KEEP_TBL = str.maketrans('', '', _ASCII_NON_DIGITS)
+_FLOAT_KEEP_TBL = str.maketrans('', '', ''.join(c for c in _ASCII_NON_DIGITS if c not in '.-,'))
+
+
+def _keep_digits(s: str) -> str:
+    """只保留数字字符（含全角等Unicode数字，与正则\\d一致）"""
+    if s.isascii():
+        return s.translate(_DIGIT_KEEP_TBL)
+    return ''.join(ch for ch in s if ch.isdecimal())
+
+
+def _keep_float_chars(s: str) -> str:
+    """只保留数字、小数点、负号和逗号"""
+    if s.isascii():
+        return s.translate(_FLOAT_KEEP_TBL)
+    return ''.join(ch for ch in s if ch.isdecimal() or ch in '.-,')
+
+
+def _index_market_tags(mapping: Dict[str, Tuple[str, ...]]) -> Tuple[Dict[str, str], Tuple[int, ...]]:
+    """将 {市场: (标识, ...)} 反转为 {标识: 市场}，并给出按长度降序的标识长度"""
+    tag_map = {tag: mkt for mkt, tags in mapping.items() for tag in tags}
+    lengths = tuple(sorted({len(tag) for tag in tag_map}, reverse=True))
+    return tag_map, lengths
+
+
+# 股票代码后缀映射
+_MARKET_SUFFIX = {
+    "sh": ("SH", "sh", ".SH", ".sh"),
+    "sz": ("SZ", "sz", ".SZ", ".sz"),
+    "bj": ("BJ", "bj", ".BJ", ".bj"),
+}
+
+# 股票代码前缀映射
+_MARKET_PREFIX = {
+    "sh": ("sh", "SH"),
+    "sz": ("sz", "SZ"),
+    "bj": ("bj", "BJ"),
+}
+
+# 标识 -> 市场的查找表，及需要尝试的标识长度（先匹配长的）
+_SUFFIX_MAP, _SUFFIX_LENGTHS = _index_market_tags(_MARKET_SUFFIX)
+_PREFIX_MAP, _PREFIX_LENGTHS = _index_market_tags(_MARKET_PREFIX)
+
+
+def _parse_common_datetime(date_str: str) -> Optional[Tuple[int, int, int, int, int, int]]:
+    """解析 YYYYMMDD、YYYY-MM-DD[ HH:MM[:SS]]（分隔符可为 - / .）等常见格式
+
+    返回 (年, 月, 日, 时, 分, 秒)；格式不符或日期不合法时返回 None。
+    """
+    if len(date_str) == 8 and date_str.isascii() and date_str.isdigit():
+        values = (int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]), 0, 0, 0)
+    else:
+        match = _COMMON_DATETIME_RE.fullmatch(date_str)
+        if not match:
+            return None
+        values = tuple(map(int, match.groups('0')))
+    try:
+        datetime(*values)
+    except ValueError:
+        return None
+    return values
+
+
+def _first_digit_run(s: str) -> str:
+    """返回第一段连续数字，没有数字时返回空串"""
+    start = -1
+    for i, ch in enumerate(s):
+        if ch.isdecimal():
+            if start < 0:
+                start = i
+        elif start >= 0:
+            return s[start:i]
+    return s[start:] if start >= 0 else ''
+
+
+def _map_unique(func: Callable[[Any], Any], values: Iterable) -> List[Any]:
+    """对一批值逐个调用func，批内重复的值只计算一次"""
+    cache = {}
+    result = []
+    for value in values:
+        # 带上类型作为键，避免 1 / 1.0 / True 这类相等的值共用结果
+        key = (type(value), value)
+        try:
+            converted = cache[key]
+        except KeyError:
+            converted = cache[key] = func(value)
+        except TypeError:  # 不可哈希的值
+            converted = func(value)
+        result.append(converted)
+    return result
+
+
+@lru_cache(maxsize=4096)
+def _classify_field(field_name: str) -> Tuple[str, ...]:
+    """根据字段名判断字段类型，返回所有命中的类型（按优先级排列）"""
+    lowered = field_name.lower()
+    return tuple(kind for kind, keywords in _FIELD_TYPE_KEYWORDS
+                 if any(keyword in lowered for keyword in keywords))
+
 
 class StockCodeFormat(Enum):
     """股票代码格式"""
@@ -25,22 +169,63 @@ class DateFormat(Enum):
     YYYYMM = "YYYYMM"  # "202401"
 
 
+def _format_code_pure_numeric(numeric_part: str, market: Optional[str]) -> str:
+    return numeric_part
+
+
+def _format_code_with_suffix(numeric_part: str, market: Optional[str]) -> str:
+    return f"{numeric_part}.{market.upper()}" if market else numeric_part
+
+
+def _format_code_with_prefix(numeric_part: str, market: Optional[str]) -> str:
+    return f"{market.lower()}{numeric_part}" if market else numeric_part
+
+
+# 股票代码目标格式 -> 输出函数，未知格式按纯数字输出
+_STOCK_CODE_FORMATTERS = {
+    StockCodeFormat.PURE_NUMERIC: _format_code_pure_numeric,
+    StockCodeFormat.WITH_SUFFIX: _format_code_with_suffix,
+    StockCodeFormat.WITH_PREFIX: _format_code_with_prefix,
+}
+
+
+def _format_date_yyyymmdd(year, month, day, hour, minute, second) -> str:
+    return f"{year:04d}{month:02d}{day:02d}"
+
+
+def _format_date_yyyy_mm_dd(year, month, day, hour, minute, second) -> str:
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def _format_date_yyyy_mm_dd_hh_mm_ss(year, month, day, hour, minute, second) -> str:
+    if hour is not None:
+        return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute or 0:02d}:{second or 0:02d}"
+    return f"{year:04d}-{month:02d}-{day:02d} 00:00:00"
+
+
+def _format_date_yyyymm(year, month, day, hour, minute, second) -> str:
+    return f"{year:04d}{month:02d}"
+
+
+# 日期目标格式 -> 输出函数，未知格式原样返回
+_DATE_FORMATTERS = {
+    DateFormat.YYYYMMDD: _format_date_yyyymmdd,
+    DateFormat.YYYY_MM_DD: _format_date_yyyy_mm_dd,
+    DateFormat.YYYY_MM_DD_HH_MM_SS: _format_date_yyyy_mm_dd_hh_mm_ss,
+    DateFormat.YYYYMM: _format_date_yyyymm,
+}
+
+
 class FieldFormatter:
     """字段格式化器"""
     
-    # 股票代码后缀映射
-    MARKET_SUFFIX = {
-        "sh": ["SH", "sh", ".SH", ".sh"],
-        "sz": ["SZ", "sz", ".SZ", ".sz"],
-        "bj": ["BJ", "bj", ".BJ", ".bj"],
-    }
+    # 股票代码后缀/前缀映射
+    MARKET_SUFFIX = _MARKET_SUFFIX
+    MARKET_PREFIX = _MARKET_PREFIX
     
-    # 股票代码前缀映射
-    MARKET_PREFIX = {
-        "sh": ["sh", "SH"],
-        "sz": ["sz", "SZ"],
-        "bj": ["bj", "BJ"],
-    }
+    # 标识 -> 市场的查找表，及需要尝试的标识长度（先匹配长的）
+    SUFFIX_MAP, SUFFIX_LENGTHS = _SUFFIX_MAP, _SUFFIX_LENGTHS
+    PREFIX_MAP, PREFIX_LENGTHS = _PREFIX_MAP, _PREFIX_LENGTHS
     
     @staticmethod
     def normalize_stock_code(code: Optional[Union[str, int]], 
@@ -57,13 +242,40 @@ class FieldFormatter:
         Returns:
             标准化后的股票代码
         """
+        formatter = _STOCK_CODE_FORMATTERS.get(target_format, _format_code_pure_numeric)
+        return FieldFormatter._normalize_stock_code(code, formatter, default_market)
+    
+    @staticmethod
+    def normalize_stock_code_pure_numeric(code: Optional[Union[str, int]],
+                                          default_market: str = "auto") -> Optional[str]:
+        """标准化为纯数字格式，如 000001"""
+        return FieldFormatter._normalize_stock_code(code, _format_code_pure_numeric, default_market)
+    
+    @staticmethod
+    def _normalize_stock_code(code: Optional[Union[str, int]],
+                              formatter: Callable[[str, Optional[str]], str],
+                              default_market: str) -> Optional[str]:
+        """提取纯数字代码和市场，交给formatter按目标格式输出"""
         if code is None:
             return None
         
-        code_str = str(code).strip()
+        code_str = (code if type(code) is str else str(code)).strip()
         if not code_str:
             return None
         
+        # 常见的规整代码（6位数字，或6位数字加 .SH 等后缀）直接输出
+        n = len(code_str)
+        if n == 6 and code_str.isascii() and code_str.isdigit():
+            if default_market == "auto":
+                market = _FIRST_DIGIT_MARKET.get(code_str[0])
+            else:
+                market = default_market
+            return formatter(code_str, market)
+        if n == 9 and code_str[6] == '.' and code_str.isascii() and code_str[:6].isdigit():
+            market = _SUFFIX_MAP.get(code_str[6:])
+            if market:
+                return formatter(code_str[:6], market)
+        
         # 1. 提取纯数字部分和市场标识
         numeric_part = ""
         market = None
@@ -72,75 +284,45 @@ class FieldFormatter:
         code_str_clean = code_str
         
         # 检查是否有后缀（按长度排序，先匹配长的）
-        all_suffixes = []
-        for mkt, suffixes in FieldFormatter.MARKET_SUFFIX.items():
-            for suffix in suffixes:
-                all_suffixes.append((mkt, suffix))
-        
-        # 按后缀长度降序排序
-        all_suffixes.sort(key=lambda x: len(x[1]), reverse=True)
-        
-        for mkt, suffix in all_suffixes:
-            if code_str_clean.endswith(suffix):
+        for n in _SUFFIX_LENGTHS:
+            suffix = code_str_clean[-n:]
+            market = _SUFFIX_MAP.get(suffix)
+            if market:
                 numeric_part = code_str_clean[:-len(suffix)]
-                market = mkt
                 break
         
         # 检查是否有前缀
         if not market:
-            all_prefixes = []
-            for mkt, prefixes in FieldFormatter.MARKET_PREFIX.items():
-                for prefix in prefixes:
-                    all_prefixes.append((mkt, prefix))
-            
-            all_prefixes.sort(key=lambda x: len(x[1]), reverse=True)
-            
-            for mkt, prefix in all_prefixes:
-                if code_str_clean.startswith(prefix):
+            for n in _PREFIX_LENGTHS:
+                prefix = code_str_clean[:n]
+                market = _PREFIX_MAP.get(prefix)
+                if market:
                     numeric_part = code_str_clean[len(prefix):]
-                    market = mkt
                     break
         
         # 如果都没有，提取数字部分
         if not market:
-            numeric_match = re.search(r'(\d+)', code_str_clean)
-            if numeric_match:
-                numeric_part = numeric_match.group(1)
+            numeric_part = _first_digit_run(code_str_clean)
+            if numeric_part:
                 # 尝试根据代码长度推断市场
                 if default_market == "auto":
                     if len(numeric_part) == 6:
-                        if numeric_part.startswith('6'):
-                            market = "sh"
-                        elif numeric_part.startswith('0') or numeric_part.startswith('3'):
-                            market = "sz"
-                        elif numeric_part.startswith('8') or numeric_part.startswith('4') or numeric_part.startswith('9'):
-                            market = "bj"
+                        market = _FIRST_DIGIT_MARKET.get(numeric_part[0])
                 else:
                     market = default_market
         
         if not numeric_part:
             return code_str
         
-        # 只保留数字
-        numeric_part = re.sub(r'[^\d]', '', numeric_part)
+        # 只保留数字（已是纯数字时无需清理）
+        if not numeric_part.isdecimal():
+            numeric_part = _keep_digits(numeric_part)
         
         # 补全到6位
         numeric_part = numeric_part.zfill(6)
         
         # 2. 按目标格式输出
-        if target_format == StockCodeFormat.PURE_NUMERIC:
-            return numeric_part
-        elif target_format == StockCodeFormat.WITH_SUFFIX:
-            if market:
-                suffix = f".{market.upper()}"
-                return f"{numeric_part}{suffix}"
-            return numeric_part
-        elif target_format == StockCodeFormat.WITH_PREFIX:
-            if market:
-                return f"{market.lower()}{numeric_part}"
-            return numeric_part
-        
-        return numeric_part
+        return formatter(numeric_part, market)
     
     @staticmethod
     def normalize_date(date_str: Optional[str], 
@@ -155,27 +337,47 @@ class FieldFormatter:
         Returns:
             标准化后的日期字符串
         """
+        return FieldFormatter._normalize_date(date_str, _DATE_FORMATTERS.get(target_format))
+    
+    @staticmethod
+    def normalize_date_yyyy_mm_dd(date_str: Optional[str]) -> Optional[str]:
+        """标准化为 2024-01-01 格式"""
+        return FieldFormatter._normalize_date(date_str, _format_date_yyyy_mm_dd)
+    
+    @staticmethod
+    def _normalize_date(date_str: Optional[str], formatter: Optional[Callable[..., str]]) -> Optional[str]:
+        """解析日期各部分，交给formatter按目标格式输出；formatter为None时原样返回"""
         if date_str is None:
             return None
         
-        date_str = str(date_str).strip()
-        if not date_str or date_str.lower() in ['nan', 'nat', 'none']:
+        date_str = (date_str if type(date_str) is str else str(date_str)).strip()
+        if not date_str or (date_str[0] in 'nN' and len(date_str) <= 4
+                            and date_str.lower() in _NULL_DATE_STRINGS):
             return None
         
+        # 未知的目标格式
+        if formatter is None:
+            return date_str
+        
         # 处理常见格式
         year = month = day = hour = minute = second = None
         
         # 优先手动解析中文日期格式（避免 pandas 错误解析）
         # 格式: 2024年1月1日, 2024年01月01日
-        cn_date_match = re.match(r'(\d{4})年(\d{1,2})月(\d{1,2})日', date_str)
+        cn_date_match = _CN_DATE_RE.match(date_str) if '年' in date_str else None
         if cn_date_match:
             year = int(cn_date_match.group(1))
             month = int(cn_date_match.group(2))
             day = int(cn_date_match.group(3))
         else:
-            # 尝试用 pandas 解析（如果可用）
+            # 常见格式直接解析，不经过 pandas
+            parsed = _parse_common_datetime(date_str)
+            if parsed:
+                year, month, day, hour, minute, second = parsed
+        
+        if year is None and pd is not None:
+            # 其他格式尝试用 pandas 解析
             try:
-                import pandas as pd
                 dt = pd.to_datetime(date_str, errors='coerce', dayfirst=False)
                 if pd.notna(dt):
                     year = dt.year
@@ -189,14 +391,11 @@ class FieldFormatter:
         
         # 如果都解析失败，手动解析
         if year is None:
-            # 提取数字部分
-            digits = re.findall(r'\d+', date_str)
-            if not digits:
+            # 提取并组合数字部分
+            combined = _keep_digits(date_str)
+            if not combined:
                 return date_str
             
-            # 组合数字
-            combined = ''.join(digits)
-            
             # 根据长度解析
             if len(combined) >= 8:
                 year = int(combined[0:4])
@@ -223,18 +422,9 @@ class FieldFormatter:
             day = 1
         
         # 生成目标格式
-        if target_format == DateFormat.YYYYMMDD and year and month and day:
-            return f"{year:04d}{month:02d}{day:02d}"
-        elif target_format == DateFormat.YYYY_MM_DD and year and month and day:
-            return f"{year:04d}-{month:02d}-{day:02d}"
-        elif target_format == DateFormat.YYYY_MM_DD_HH_MM_SS and year and month and day:
-            if hour is not None:
-                return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute or 0:02d}:{second or 0:02d}"
-            return f"{year:04d}-{month:02d}-{day:02d} 00:00:00"
-        elif target_format == DateFormat.YYYYMM and year and month:
-            return f"{year:04d}{month:02d}"
-        
-        return date_str
+        if not year:
+            return date_str
+        return formatter(year, month, day, hour, minute, second)
     
     @staticmethod
     def normalize_float(value: Optional[Union[str, float, int]]) -> Optional[float]:
@@ -245,8 +435,9 @@ class FieldFormatter:
         if isinstance(value, (int, float)):
             return float(value)
         
-        value_str = str(value).strip()
-        if not value_str or value_str == '-' or value_str.lower() in ['nan', 'none']:
+        value_str = (value if type(value) is str else str(value)).strip()
+        if not value_str or value_str == '-' or (value_str[0] in 'nN' and len(value_str) <= 4
+                                                 and value_str.lower() in _NULL_NUMBER_STRINGS):
             return None
         
         # 处理百分比
@@ -256,27 +447,18 @@ class FieldFormatter:
             value_str = value_str.replace('%', '')
         
         # 清理字符串，保留数字、小数点、负号、逗号
-        value_str = re.sub(r'[^\d\.\-\,]', '', value_str)
-        
-        # 处理千位分隔符 - 先移除所有逗号（假设都是千位分隔符）
-        # 这样可以确保 1,234.56 变成 1234.56
-        if ',' in value_str and '.' in value_str:
-            # 同时有逗号和小数点，逗号应该是千位分隔符
-            value_str = value_str.replace(',', '')
-        elif ',' in value_str:
-            # 只有逗号，看后面的长度
-            parts = value_str.split(',')
-            if len(parts) > 2:
-                # 多个逗号，千位分隔符
+        value_str = _keep_float_chars(value_str)
+        
+        # 处理千位分隔符
+        comma = value_str.find(',')
+        if comma >= 0:
+            last_comma = value_str.rfind(',')
+            if '.' in value_str or comma != last_comma or len(value_str) - last_comma == 4:
+                # 有小数点、多个逗号或逗号后恰好3位：逗号是千位分隔符
                 value_str = value_str.replace(',', '')
-            elif len(parts) == 2:
-                # 一个逗号
-                if len(parts[1]) == 3:
-                    # 千位分隔符
-                    value_str = value_str.replace(',', '')
-                else:
-                    # 小数点
-                    value_str = value_str.replace(',', '.')
+            else:
+                # 单个逗号作小数点
+                value_str = value_str.replace(',', '.')
         
         try:
             result = float(value_str)
@@ -297,33 +479,87 @@ class FieldFormatter:
         if isinstance(value, float):
             return int(round(value))
         
-        value_str = str(value).strip()
-        if not value_str or value_str == '-' or value_str.lower() in ['nan', 'none']:
+        value_str = (value if type(value) is str else str(value)).strip()
+        if not value_str or value_str == '-' or (value_str[0] in 'nN' and len(value_str) <= 4
+                                                 and value_str.lower() in _NULL_NUMBER_STRINGS):
             return None
         
+        # 纯整数字符串直接转换（15位以内，与经浮点数取整的结果一致）
+        digits = value_str[1:] if value_str[0] == '-' else value_str
+        if len(digits) <= 15 and digits.isascii() and digits.isdigit():
+            return int(value_str)
+        
         # 先尝试作为浮点数解析，再取整
         float_val = FieldFormatter.normalize_float(value_str)
         if float_val is not None:
             return int(round(float_val))
         
         return None
+    
+    @staticmethod
+    def normalize_stock_codes(codes: Iterable[Optional[Union[str, int]]],
+                              target_format: StockCodeFormat = StockCodeFormat.PURE_NUMERIC,
+                              default_market: str = "auto") -> List[Optional[str]]:
+        """批量标准化股票代码，结果与逐个调用 normalize_stock_code 一致"""
+        formatter = _STOCK_CODE_FORMATTERS.get(target_format, _format_code_pure_numeric)
+        return _map_unique(
+            lambda code: FieldFormatter._normalize_stock_code(code, formatter, default_market),
+            codes)
+    
+    @staticmethod
+    def normalize_floats(values: Iterable[Optional[Union[str, float, int]]]) -> List[Optional[float]]:
+        """批量标准化浮点数，结果与逐个调用 normalize_float 一致"""
+        return _map_unique(FieldFormatter.normalize_float, values)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# 字段类型 -> 字符串值的转换函数（非字符串值交给下一个命中的类型）
+_STR_VALUE_CONVERTERS = {
+    'date': FieldFormatter.normalize_date_yyyy_mm_dd,
+    'code': FieldFormatter.normalize_stock_code_pure_numeric,
+}
+
+
+def _build_value_converter(kinds: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """按命中的字段类型（优先级顺序）组合出单值转换函数"""
+    if not kinds:
+        return _identity
+    if kinds[0] == 'float':
+        return FieldFormatter.normalize_float
+    
+    str_converter = _STR_VALUE_CONVERTERS[kinds[0]]
+    fallback = _build_value_converter(kinds[1:])
+    
+    def convert(value: Any) -> Any:
+        if isinstance(value, str):
+            return str_converter(value)
+        return fallback(value)
+    return convert
+
+
+@lru_cache(maxsize=4096)
+def _value_converter(field_name: str) -> Callable[[Any], Any]:
+    """字段名对应的单值转换函数"""
+    return _build_value_converter(_classify_field(field_name))
 
 
 class InterfaceFieldConverter:
     """接口字段转换器，根据接口配置进行字段转换"""
     
+    __slots__ = ('mapping_file', 'mapping_data', '_reverse_input_cache')
+    
     def __init__(self, mapping_file: str = "result/complete_field_mapping.json"):
         self.mapping_file = mapping_file
         self.mapping_data = None
+        self._reverse_input_cache = {}
         self._load_mapping()
     
     def _load_mapping(self):
         """加载映射数据"""
-        import os
-        import json
-        if os.path.exists(self.mapping_file):
-            with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                self.mapping_data = json.load(f)
+        self.mapping_data = load_json_cached(self.mapping_file)
     
     def convert_field_from_api(self, field_name: str, value: Any, 
                              api_name: str) -> Tuple[str, Any]:
@@ -369,38 +605,92 @@ class InterfaceFieldConverter:
             return field_name, value
         
         # 查找字段映射（反向查找）
-        interface_fields = self.mapping_data.get('interface_to_fields', {}).get(api_name, {})
-        input_mapping = interface_fields.get('input', {})
-        
-        # 找到对应的原始字段名
-        api_field_name = field_name
-        for orig, canonical in input_mapping.items():
-            if canonical == field_name:
-                api_field_name = orig
-                break
+        api_field_name = self._reverse_input_mapping(api_name).get(field_name, field_name)
         
         # 根据字段类型进行值转换
         converted_value = self._convert_value_for_api(api_field_name, value, api_name)
         
         return api_field_name, converted_value
     
-    def _convert_value(self, field_name: str, value: Any) -> Any:
-        """根据标准字段名转换值"""
-        # 日期字段
-        if any(keyword in field_name.lower() for keyword in ['date', '日期', '时间', 'time']):
-            if isinstance(value, str):
-                return FieldFormatter.normalize_date(value, DateFormat.YYYY_MM_DD)
+    def convert_column(self, field_name: str, series: "pd.Series") -> "pd.Series":
+        """
+        按标准字段名转换一整列值
         
-        # 股票代码字段
-        if any(keyword in field_name.lower() for keyword in ['symbol', 'code', '代码']):
-            if isinstance(value, str):
-                return FieldFormatter.normalize_stock_code(value, StockCodeFormat.PURE_NUMERIC)
+        字段类型只判断一次，规整格式的值用pandas向量化转换，其余值逐个
+        回退到 _convert_value，结果与逐值转换一致（数值列中的None记为NaN）。
         
-        # 数值字段
-        if any(keyword in field_name.lower() for keyword in ['price', 'close', 'open', 'high', 'low', 'volume', 'amount', '涨', '跌', '价', '额', '量']):
-            return FieldFormatter.normalize_float(value)
+        Args:
+            field_name: 标准字段名
+            series: 字段值列
+            
+        Returns:
+            转换后的列
+        """
+        kinds = _classify_field(field_name)
+        if not kinds:
+            return series
+        
+        if kinds[0] == 'float':
+            return _convert_float_column(series)
+        
+        # 日期/代码只转换字符串值，非字符串值按剩余类型逐个处理；
+        # 结果按位置写入列表，不经pandas推断dtype，避免改变值类型（如 1 -> 1.0）
+        values = series.tolist()
+        str_pos = [i for i, v in enumerate(values) if isinstance(v, str)]
+        result = list(values)
+        if str_pos:
+            strings = pd.Series([values[i] for i in str_pos], dtype=object)
+            if kinds[0] == 'date':
+                converted = _convert_date_strings(strings)
+            else:
+                converted = _convert_code_strings(strings)
+            for i, value in zip(str_pos, converted.tolist()):
+                result[i] = value
+        if len(kinds) > 1 and len(str_pos) < len(values):
+            convert = _value_converter(field_name)
+            for i, value in enumerate(values):
+                if not isinstance(value, str):
+                    result[i] = convert(value)
+        return pd.Series(result, index=series.index, dtype=object, name=series.name)
+    
+    def convert_dataframe_from_api(self, df: "pd.DataFrame", api_name: str) -> "pd.DataFrame":
+        """
+        将API返回的整张表转换为标准字段名和标准值格式
         
-        return value
+        Args:
+            df: API返回的DataFrame
+            api_name: API名称
+            
+        Returns:
+            转换后的DataFrame
+        """
+        if not self.mapping_data:
+            return df
+        
+        interface_fields = self.mapping_data.get('interface_to_fields', {}).get(api_name, {})
+        output_mapping = interface_fields.get('output', {})
+        
+        converted = {}
+        for field_name in df.columns:
+            canonical_name = output_mapping.get(field_name, field_name)
+            converted[canonical_name] = self.convert_column(canonical_name, df[field_name])
+        return pd.DataFrame(converted, index=df.index)
+    
+    def _reverse_input_mapping(self, api_name: str) -> Dict[str, str]:
+        """接口输入字段的反向映射 {标准字段名: 原始字段名}，按接口缓存"""
+        reverse_mapping = self._reverse_input_cache.get(api_name)
+        if reverse_mapping is None:
+            interface_fields = self.mapping_data.get('interface_to_fields', {}).get(api_name, {})
+            reverse_mapping = {}
+            for orig, canonical in interface_fields.get('input', {}).items():
+                # 多个原始字段对应同一标准字段时取第一个
+                reverse_mapping.setdefault(canonical, orig)
+            self._reverse_input_cache[api_name] = reverse_mapping
+        return reverse_mapping
+    
+    def _convert_value(self, field_name: str, value: Any) -> Any:
+        """根据标准字段名转换值"""
+        return _value_converter(field_name)(value)
     
     def _convert_value_for_api(self, field_name: str, value: Any, api_name: str) -> Any:
         """根据API需要转换值格式"""
@@ -409,6 +699,55 @@ class InterfaceFieldConverter:
         return self._convert_value(field_name, value)
 
 
+def _convert_float_column(series: "pd.Series") -> "pd.Series":
+    """整列标准化浮点数：纯数字字符串直接转换，其余值逐个调用 normalize_float"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    
+    result = pd.Series(float('nan'), index=series.index, dtype=float)
+    is_str = series.map(lambda v: isinstance(v, str)).astype(bool)
+    plain = pd.Series(False, index=series.index)
+    if is_str.any():
+        stripped = series[is_str].str.strip()
+        plain_str = stripped.str.fullmatch(_PLAIN_FLOAT_PATTERN, flags=re.ASCII)
+        plain[is_str] = plain_str
+        result[plain] = stripped[plain_str].astype(float)
+    rest = ~plain
+    if rest.any():
+        result[rest] = pd.Series(FieldFormatter.normalize_floats(series[rest]),
+                                 index=series.index[rest], dtype=float)
+    return result
+
+
+def _convert_date_strings(strings: "pd.Series") -> "pd.Series":
+    """整列将日期字符串转换为 YYYY-MM-DD，无法向量化解析的值逐个调用 normalize_date"""
+    stripped = strings.str.strip()
+    result = pd.Series(None, index=strings.index, dtype=object)
+    done = pd.Series(False, index=strings.index)
+    for pattern, fmt in ((_ISO_DATE_PATTERN, '%Y-%m-%d'), (_YYYYMMDD_PATTERN, '%Y%m%d')):
+        mask = stripped.str.fullmatch(pattern, flags=re.ASCII) & ~done
+        if not mask.any():
+            continue
+        parsed = pd.to_datetime(stripped[mask], format=fmt, errors='coerce')
+        parsed = parsed[parsed.notna()]
+        result[parsed.index] = parsed.dt.strftime('%Y-%m-%d')
+        done[parsed.index] = True
+    rest = ~done
+    if rest.any():
+        result[rest] = strings[rest].map(FieldFormatter.normalize_date_yyyy_mm_dd)
+    return result
+
+
+def _convert_code_strings(strings: "pd.Series") -> "pd.Series":
+    """整列将股票代码字符串转换为纯数字，非规整代码逐个调用 normalize_stock_code"""
+    result = strings.str.strip().str.extract(
+        f'^{_CLEAN_CODE_PATTERN}$', flags=re.ASCII, expand=False).astype(object)
+    rest = result.isna()
+    if rest.any():
+        result[rest] = FieldFormatter.normalize_stock_codes(strings[rest], StockCodeFormat.PURE_NUMERIC)
+    return result
+
+
 def main():
     """测试字段格式化器"""
     print("=" * 80)
@@ -10,6 +10,7 @@ import sys
 import os
 import json
 import re
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 
 # 添加src目录到路径
@@ -19,22 +20,48 @@ from parsers.md_parser import DataInterfaceParser
 from mappers.field_mapper import FieldMapper
 from formatters.field_formatter import FieldFormatter
 from testers.interface_tester import InterfaceTester
+from utils.common import load_json_cached
+
+
+# 参数类型 -> 参数名关键词，按判断优先级排列
+_PARAM_TYPE_KEYWORDS = (
+    ('code', ('symbol', 'code', 'stock', 'bond', 'fund', 'index')),
+    ('date', ('date', 'time', 'year', 'month')),
+    ('float', ('price', 'amount', 'value', 'rate', 'percent')),
+)
+
+# 参数类型 -> 值标准化函数
+_PARAM_NORMALIZERS = {
+    'code': FieldFormatter.normalize_stock_code_pure_numeric,
+    'date': FieldFormatter.normalize_date_yyyy_mm_dd,
+    'float': lambda value: FieldFormatter.normalize_float(value) if isinstance(value, str) else value,
+    None: lambda value: value,
+}
+
+
+@lru_cache(maxsize=4096)
+def _classify_param(param_name: str) -> Optional[str]:
+    """根据参数名判断参数类型，无法判断时返回None"""
+    param_name_lower = param_name.lower()
+    for kind, keywords in _PARAM_TYPE_KEYWORDS:
+        if any(keyword in param_name_lower for keyword in keywords):
+            return kind
+    return None
 
 
 class InterfaceExecutor:
     """接口执行器，处理参数统一化和执行"""
     
+    __slots__ = ('mapping_data', 'field_mapper', '_param_indices')
+    
     def __init__(self):
         self.mapping_data = self._load_mapping_data()
         self.field_mapper = FieldMapper()
+        self._param_indices = {}
     
     def _load_mapping_data(self) -> Dict[str, Any]:
         """加载接口映射数据"""
-        mapping_file = "result/complete_field_mapping.json"
-        if os.path.exists(mapping_file):
-            with open(mapping_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return load_json_cached("result/complete_field_mapping.json") or {}
     
     def get_interface_info(self, api_name: str) -> Optional[Dict[str, Any]]:
         """获取接口信息"""
@@ -46,59 +73,70 @@ class InterfaceExecutor:
         if not interface_info:
             raise ValueError(f"接口 {api_name} 不存在")
         
-        input_params = interface_info.get('input_params', [])
+        param_map, alias_index, standard_index = self._get_param_indices(api_name, interface_info)
         normalized = {}
         
-        # 构建参数映射
-        param_map = {}
-        for param in input_params:
-            param_name = param.get('名称')
-            param_map[param_name.lower()] = param_name
-        
         # 处理用户参数
         for key, value in user_params.items():
             key_lower = key.lower()
             
             # 查找匹配的参数
-            matched = False
-            for param_name, original_name in param_map.items():
-                if param_name == key_lower:
-                    normalized[original_name] = self._normalize_value(original_name, value)
-                    matched = True
-                    break
+            original_name = param_map.get(key_lower)
             
-            # 尝试字段等价关系
-            if not matched:
-                for standard_field, equivalents in self.field_mapper.field_equivalents.items():
-                    if key in equivalents or key_lower == standard_field.lower():
-                        for param_name, original_name in param_map.items():
-                            if param_name in equivalents or param_name == standard_field.lower():
-                                normalized[original_name] = self._normalize_value(original_name, value)
-                                matched = True
-                                break
-                    if matched:
-                        break
+            # 尝试字段等价关系：取优先级最高的（标准字段顺序最靠前）
+            if original_name is None:
+                candidates = [hit for hit in (alias_index.get(key), standard_index.get(key_lower)) if hit]
+                if candidates:
+                    original_name = min(candidates)[1]
+            
+            if original_name is not None:
+                normalized[original_name] = self._normalize_value(original_name, value)
         
         return normalized
     
-    def _normalize_value(self, param_name: str, value: Any) -> Any:
-        """标准化值"""
-        param_name_lower = param_name.lower()
+    def _get_param_indices(self, api_name: str, interface_info: Dict[str, Any]):
+        """
+        构建并缓存接口的参数查找表
         
-        # 股票代码标准化
-        if any(keyword in param_name_lower for keyword in ['symbol', 'code', 'stock', 'bond', 'fund', 'index']):
-            return FieldFormatter.normalize_stock_code(value)
+        Returns:
+            (小写参数名 -> 参数名,
+             等价字段名 -> (标准字段序号, 参数名),
+             小写标准字段名 -> (标准字段序号, 参数名))
+        """
+        cached = self._param_indices.get(api_name)
+        if cached is not None:
+            return cached
         
-        # 日期标准化
-        elif any(keyword in param_name_lower for keyword in ['date', 'time', 'year', 'month']):
-            return FieldFormatter.normalize_date(value)
+        # 构建参数映射
+        param_map = {}
+        for param in interface_info.get('input_params', []):
+            param_name = param.get('名称')
+            param_map[param_name.lower()] = param_name
         
-        # 数值标准化
-        elif any(keyword in param_name_lower for keyword in ['price', 'amount', 'value', 'rate', 'percent']):
-            if isinstance(value, str):
-                return FieldFormatter.normalize_float(value)
+        # 每个标准字段对应接口中第一个匹配的参数
+        alias_index = {}
+        standard_index = {}
+        equivalent_sets = self.field_mapper.equivalent_sets
+        for order, (standard_field, equivalents) in enumerate(equivalent_sets.items()):
+            standard_lower = standard_field.lower()
+            target = None
+            for param_name, original_name in param_map.items():
+                if param_name in equivalents or param_name == standard_lower:
+                    target = (order, original_name)
+                    break
+            if target is None:
+                continue
+            for alias in equivalents:
+                alias_index.setdefault(alias, target)
+            standard_index.setdefault(standard_lower, target)
         
-        return value
+        cached = (param_map, alias_index, standard_index)
+        self._param_indices[api_name] = cached
+        return cached
+    
+    def _normalize_value(self, param_name: str, value: Any) -> Any:
+        """标准化值"""
+        return _PARAM_NORMALIZERS[_classify_param(param_name)](value)
     
     def execute(self, api_name: str, user_params: Dict[str, Any]) -> Any:
         """执行接口"""
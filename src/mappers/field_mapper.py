@@ -5,15 +5,172 @@
 提供完整的字段查询和转换功能
 """
 
-import pandas as pd
-import json
+import csv
 import os
 import re
 from collections import defaultdict, Counter
-from typing import Dict, List, Set, Tuple, Any
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple, Any, Optional
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.common import dump_json, load_json_cached
+
+# 接口信息
+API_PATTERN = re.compile(r'接口:\s*(.+?)\n目标地址:\s*(.+?)\n描述:\s*(.+?)\n', re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _table_re(table_name: str) -> re.Pattern:
+    """表名后紧跟的markdown表格"""
+    return re.compile(
+        rf"{table_name}\s*\n"
+        r"\|(.+)\|\s*\n"
+        r"\|([\-:]+\|)+\s*\n"
+        r"((?:\|.+\|\s*\n)+)"
+    )
+
+
+@lru_cache(maxsize=None)
+def _prefixed_table_re(prefix: str) -> re.Pattern:
+    """以prefix开头的标题（如 '输出参数-实时行情数据'）后的markdown表格"""
+    return re.compile(rf"({prefix}[^\n]*)\s*\n\|(.+)\|\s*\n\|([\-:]+\|)+\s*\n((?:\|.+\|\s*\n)+)")
+
+
+# 参数表中名称/类型/描述列可能使用的表头，按优先级排列
+NAME_KEYS = ('名称', 'name', 'Name', '字段名', '字段')
+TYPE_KEYS = ('类型', 'type', 'Type')
+DESC_KEYS = ('描述', 'description', 'Description', '说明')
+
+# (参数类别, 接口信息中的参数列表键, 需要跳过的参数名)
+_PARAM_SECTIONS = (
+    ('input', 'input_params', frozenset(('-', '无'))),
+    ('output', 'output_params', frozenset(('-',))),
+)
+
+
+# 字段查询表、接口查询表的列
+FIELD_TABLE_COLUMNS = ('标准字段名', '别名', '常见类型', '可从接口获取', '输出接口示例', '可用于接口参数', '输入接口示例')
+INTERFACE_TABLE_COLUMNS = ('接口名', '数据类型', '描述', '输入参数数量', '输入参数', '输出字段数量', '输出字段')
+
+
+def _write_csv(path: str, columns: Tuple[str, ...], rows: List[Dict[str, Any]]):
+    """逐行写出CSV（带BOM的UTF-8，便于Excel打开）"""
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _first_key(param: Dict[str, str], keys: Tuple[str, ...]):
+    """返回param中第一个存在的表头，都不存在时返回None"""
+    for key in keys:
+        if key in param:
+            return key
+    return None
+
+
+def _table_rows(header_row: str, body: str) -> List[Dict[str, str]]:
+    """将markdown表格的表头行和表体转换为字典列表，列数与表头不一致的行跳过"""
+    headers = [h.strip() for h in header_row.split('|') if h.strip()]
+    n_cols = len(headers)
+    rows = []
+    
+    for row in body.strip().split('\n'):
+        if not row.strip() or '|---' in row:
+            continue
+        cells = row.split('|')
+        # 去掉首尾竖线外侧的部分后，先比较列数再逐格strip
+        if max(len(cells) - 2, 0) != n_cols:
+            continue
+        rows.append(dict(zip(headers, map(str.strip, cells[1:-1]))))
+    
+    return rows
+
+
+def _parse_table(section: str, table_name: str,
+                 start: int = 0, end: Optional[int] = None) -> List[Dict]:
+    """解析表格，只在 section[start:end] 内查找"""
+    match = _table_re(table_name).search(section, start, len(section) if end is None else end)
+    if not match:
+        return []
+
+    return _table_rows(match.group(1), match.group(3))
+
+
+def _parse_table_with_prefix(section: str, prefix: str,
+                             start: int = 0, end: Optional[int] = None) -> List[Dict]:
+    """解析带有前缀的表格（如 '输出参数'、'输出参数-实时行情数据'），只在 section[start:end] 内查找"""
+    if end is None:
+        end = len(section)
+
+    # 两种表格都以prefix开头：先用子串查找定位，没有出现时不必运行正则
+    start = section.find(prefix, start, end)
+    if start < 0:
+        return []
+
+    # 先尝试精确匹配
+    rows = _parse_table(section, prefix, start, end)
+    if rows:
+        return rows
+
+    # 尝试带后缀的匹配
+    match = _prefixed_table_re(prefix).search(section, start, end)
+    if not match:
+        return []
+
+    return _table_rows(match.group(2), match.group(4))
+
+
+def _parse_file_with_detail(file_path: str, data_type: str) -> List[Dict]:
+    """解析单个文件并获取详细参数"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        print(f"✗ 读取文件 {file_path} 失败: {e}")
+        return []
+
+    # 没有接口标记的文件不必运行正则
+    if '接口:' not in content:
+        return []
+
+    interfaces = []
+
+    # 匹配接口信息
+    api_matches = list(API_PATTERN.finditer(content))
+
+    for idx, match in enumerate(api_matches):
+        func_name = match.group(1).strip()
+        target_url = match.group(2).strip()
+        description = match.group(3).strip()
+
+        # 接口段落: 从本接口开始到下一个接口开始（直接在content中按位置搜索，不复制子串）
+        section = (match.start(), api_matches[idx + 1].start() if idx + 1 < len(api_matches) else len(content))
+
+        # 解析输入参数
+        input_params = _parse_table_with_prefix(content, "输入参数", *section)
+
+        # 解析输出参数
+        output_params = _parse_table_with_prefix(content, "输出参数", *section)
+
+        interface = {
+            'func_name': func_name,
+            'target_url': target_url,
+            'description': description,
+            'data_type': data_type,
+            'input_params': input_params,
+            'output_params': output_params,
+        }
+
+        interfaces.append(interface)
+
+    return interfaces
+
 
 class FieldMapper:
     def __init__(self, data_dir: str = "data", output_dir: str = "result"):
@@ -126,6 +283,16 @@ class FieldMapper:
             "datetime64": "datetime",
         }
         
+        # 原始类型写法 -> 标准类型，构建映射时按需填充，同一写法只做一次lower()
+        self._normalized_types = {}
+        
+        # 等价字段集合，供成员判断使用（field_equivalents保留列表以便按顺序输出和序列化）
+        self.equivalent_sets = {k: frozenset(v) for k, v in self.field_equivalents.items()}
+        
+        # 字段名查找表，按等价关系的定义顺序决定优先级
+        self._name_index, self._alias_index = self._build_alias_index()
+        self._canonical_cache = {}  # 原始字段名 -> 标准名
+        
         # 数据存储
         self.interfaces = {}  # 接口信息
         self.fields = {}  # 字段信息
@@ -134,22 +301,46 @@ class FieldMapper:
     
     def get_canonical_name(self, field_name: str) -> str:
         """获取字段的标准名称"""
-        if pd.isna(field_name) or field_name == "nan" or field_name == "" or field_name == "-":
+        # 同名参数在大量接口中重复出现，字符串结果按原始名称缓存
+        cached = self._canonical_cache.get(field_name) if isinstance(field_name, str) else None
+        if cached is not None:
+            return cached
+        
+        # 空值（None/NaN）及占位符原样返回
+        if field_name is None or (isinstance(field_name, float) and field_name != field_name) \
+                or field_name == "nan" or field_name == "" or field_name == "-":
             return field_name
             
         field_name_str = str(field_name).strip()
-        field_name_lower = field_name_str.lower()
-        
-        # 检查预定义的等价关系
-        for canonical, equivalents in self.field_equivalents.items():
-            if field_name_str == canonical:
-                return canonical
-            if field_name_str in equivalents:
-                return canonical
-            if field_name_lower in [e.lower() for e in equivalents]:
-                return canonical
-        
-        return field_name_str
+        
+        # 原样拼写一次命中；未命中再按小写别名查找
+        canonical = self._name_index.get(field_name_str) or self._alias_index.get(field_name_str.lower(), field_name_str)
+        if isinstance(field_name, str):
+            self._canonical_cache[field_name] = canonical
+        return canonical
+    
+    def _build_alias_index(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        构建字段名查找表
+        
+        规则：标准名精确匹配，或别名忽略大小写匹配，取定义顺序靠前者。
+        
+        Returns:
+            (原样拼写 -> 标准名, 小写别名 -> 标准名)。前者预先合并了标准名和别名的
+            各种原样拼写的结果，后者处理其他大小写形式
+        """
+        canonical_order = {}
+        alias_index = {}
+        for order, (canonical, equivalents) in enumerate(self.field_equivalents.items()):
+            canonical_order[canonical] = (order, canonical)
+            for equivalent in equivalents:
+                alias_index.setdefault(equivalent.lower(), (order, canonical))
+        
+        name_index = {}
+        for name in (*canonical_order, *(e for eqs in self.field_equivalents.values() for e in eqs)):
+            hits = [hit for hit in (canonical_order.get(name), alias_index.get(name.lower())) if hit]
+            name_index[name] = min(hits)[1]
+        return name_index, {alias: canonical for alias, (_, canonical) in alias_index.items()}
     
     def parse_all_interfaces(self) -> Dict[str, Any]:
         """解析所有接口，获取详细的输入输出参数"""
@@ -157,123 +348,17 @@ class FieldMapper:
         
         all_interfaces = {}
         
-        for fname in sorted(os.listdir(self.data_dir)):
-            if fname.endswith('.md.txt'):
-                file_path = os.path.join(self.data_dir, fname)
-                data_type = fname.replace('.md.txt', '')
-                
-                interfaces = self._parse_file_with_detail(file_path, data_type)
-                for iface in interfaces:
-                    all_interfaces[iface['func_name']] = iface
+        with os.scandir(self.data_dir) as it:
+            entries = sorted((e for e in it if e.name.endswith('.md.txt')), key=lambda e: e.name)
+        
+        # 文件总量很小，串行解析即可（进程池的启动开销远大于解析本身）
+        for entry in entries:
+            for iface in _parse_file_with_detail(entry.path, entry.name[:-len('.md.txt')]):
+                all_interfaces[iface['func_name']] = iface
         
         print(f"✓ 解析完成，共 {len(all_interfaces)} 个接口")
         return all_interfaces
     
-    def _parse_file_with_detail(self, file_path: str, data_type: str) -> List[Dict]:
-        """解析单个文件并获取详细参数"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"✗ 读取文件 {file_path} 失败: {e}")
-            return []
-        
-        interfaces = []
-        
-        # 匹配接口信息
-        api_pattern = r'接口:\s*(.+?)\n目标地址:\s*(.+?)\n描述:\s*(.+?)\n'
-        api_matches = list(re.finditer(api_pattern, content, re.DOTALL))
-        
-        for idx, match in enumerate(api_matches):
-            func_name = match.group(1).strip()
-            target_url = match.group(2).strip()
-            description = match.group(3).strip()
-            
-            # 找到这个接口所在的段落
-            api_start = match.start()
-            api_end = match.end()
-            
-            # 确定段落边界
-            section_start = content.rfind('\n', 0, api_start)
-            if section_start == -1:
-                section_start = 0
-            else:
-                section_start += 1
-            
-            section_end = len(content)
-            if idx < len(api_matches) - 1:
-                section_end = api_matches[idx + 1].start()
-            
-            section_content = content[section_start:section_end]
-            
-            # 解析输入参数
-            input_params = self._parse_table_with_prefix(section_content, "输入参数")
-            
-            # 解析输出参数
-            output_params = self._parse_table_with_prefix(section_content, "输出参数")
-            
-            interface = {
-                'func_name': func_name,
-                'target_url': target_url,
-                'description': description,
-                'data_type': data_type,
-                'input_params': input_params,
-                'output_params': output_params,
-            }
-            
-            interfaces.append(interface)
-        
-        return interfaces
-    
-    def _parse_table_with_prefix(self, section: str, prefix: str) -> List[Dict]:
-        """解析带有前缀的表格（如 '输出参数'、'输出参数-实时行情数据'）"""
-        # 先尝试精确匹配
-        rows = self._parse_table(section, prefix)
-        if rows:
-            return rows
-        
-        # 尝试带后缀的匹配
-        pattern = rf"({prefix}[^\n]*)\s*\n\|(.+)\|\s*\n\|([\-:]+\|)+\s*\n((?:\|.+\|\s*\n)+)"
-        match = re.search(pattern, section)
-        if not match:
-            return []
-        
-        headers = [h.strip() for h in match.group(2).split('|') if h.strip()]
-        rows = []
-        
-        for row in match.group(4).strip().split('\n'):
-            if not row.strip() or '|---' in row:
-                continue
-            cells = [c.strip() for c in row.split('|')[1:-1]]
-            if len(cells) == len(headers):
-                rows.append(dict(zip(headers, cells)))
-        
-        return rows
-    
-    def _parse_table(self, section: str, table_name: str) -> List[Dict]:
-        """解析表格"""
-        pattern = (
-            rf"{table_name}\s*\n"
-            r"\|(.+)\|\s*\n"
-            r"\|([\-:]+\|)+\s*\n"
-            r"((?:\|.+\|\s*\n)+)"
-        )
-        match = re.search(pattern, section)
-        if not match:
-            return []
-        
-        headers = [h.strip() for h in match.group(1).split('|') if h.strip()]
-        rows = []
-        
-        for row in match.group(3).strip().split('\n'):
-            if not row.strip() or '|---' in row:
-                continue
-            cells = [c.strip() for c in row.split('|')[1:-1]]
-            if len(cells) == len(headers):
-                rows.append(dict(zip(headers, cells)))
-        
-        return rows
-    
     def build_mapping(self, interfaces: Dict[str, Any]):
         """构建字段映射关系"""
         print("\n正在构建字段映射关系...")
@@ -281,89 +366,92 @@ class FieldMapper:
         for func_name, iface in interfaces.items():
             self.interfaces[func_name] = iface
             
-            self.interface_to_fields[func_name] = {
+            # 本接口各参数类别的 原始名 -> 标准名 字典，循环内直接写入，不再逐参数两级查找
+            field_sections = self.interface_to_fields[func_name] = {
                 'input': {},
                 'output': {},
             }
             
-            # 处理输入参数
-            for param in iface.get('input_params', []):
-                # 查找名称字段
-                param_name = None
-                for key in ['名称', 'name', 'Name', '字段名', '字段']:
-                    if key in param:
-                        param_name = param[key]
-                        break
-                
-                if param_name and param_name != '-' and param_name != '无':
-                    canonical = self.get_canonical_name(param_name)
-                    self._add_field_mapping(canonical, param_name, func_name, 'input', param)
-            
-            # 处理输出参数
-            for param in iface.get('output_params', []):
-                # 查找名称字段
-                param_name = None
-                for key in ['名称', 'name', 'Name', '字段名', '字段']:
-                    if key in param:
-                        param_name = param[key]
-                        break
-                
-                if param_name and param_name != '-':
-                    canonical = self.get_canonical_name(param_name)
-                    self._add_field_mapping(canonical, param_name, func_name, 'output', param)
+            # 处理输入参数、输出参数
+            for param_type, params_key, skipped_names in _PARAM_SECTIONS:
+                section_fields = field_sections[param_type]
+                for param in iface.get(params_key, []):
+                    # 查找名称字段
+                    name_key = _first_key(param, NAME_KEYS)
+                    param_name = param[name_key] if name_key else None
+                    
+                    if param_name and param_name not in skipped_names:
+                        canonical = self.get_canonical_name(param_name)
+                        section_fields[param_name] = canonical
+                        self._add_field_mapping(canonical, param_name, func_name, param_type, param)
         
         print(f"✓ 构建完成，共 {len(self.fields)} 个标准字段")
     
     def _add_field_mapping(self, canonical: str, original: str, func_name: str, param_type: str, param: Dict):
-        """添加字段映射"""
+        """添加字段映射（接口 → 字段的记录由 build_mapping 写入）"""
         self.field_to_interfaces[canonical].add(func_name)
-        self.interface_to_fields[func_name][param_type][original] = canonical
         
-        if canonical not in self.fields:
-            self.fields[canonical] = {
+        info = self.fields.get(canonical)
+        if info is None:
+            info = self.fields[canonical] = {
                 'canonical_name': canonical,
                 'aliases': set(),
                 'interfaces': [],
                 'input_interfaces': [],
                 'output_interfaces': [],
+                # 与接口列表并行的集合，用于O(1)去重，不参与输出
+                '_input_seen': set(),
+                '_output_seen': set(),
                 'types': Counter(),
-                'descriptions': [],
+                '_mode_type': 'string',
+                '_mode_count': 0,
+                'descriptions': set(),  # 插入时去重，重复描述不再累积
             }
         
-        self.fields[canonical]['aliases'].add(original)
+        info['aliases'].add(original)
         
         if param_type == 'input':
-            if func_name not in self.fields[canonical]['input_interfaces']:
-                self.fields[canonical]['input_interfaces'].append(func_name)
+            interfaces, seen = info['input_interfaces'], info['_input_seen']
         else:
-            if func_name not in self.fields[canonical]['output_interfaces']:
-                self.fields[canonical]['output_interfaces'].append(func_name)
+            interfaces, seen = info['output_interfaces'], info['_output_seen']
+        if func_name not in seen:
+            seen.add(func_name)
+            interfaces.append(func_name)
         
         # 记录类型
-        for key in ['类型', 'type', 'Type']:
-            if key in param:
-                field_type = param[key]
-                normalized_type = self.type_mapping.get(field_type.lower(), field_type.lower())
-                self.fields[canonical]['types'][normalized_type] += 1
-                break
+        type_key = _first_key(param, TYPE_KEYS)
+        if type_key:
+            field_type = param[type_key]
+            normalized_type = self._normalized_types.get(field_type)
+            if normalized_type is None:
+                lowered = field_type.lower()
+                normalized_type = self._normalized_types[field_type] = self.type_mapping.get(lowered, lowered)
+            types = info['types']
+            types[normalized_type] += 1
+            # 增量维护众数类型；计数相同时与 most_common 一致，取最先出现的类型
+            count = types[normalized_type]
+            if count > info['_mode_count']:
+                info['_mode_type'], info['_mode_count'] = normalized_type, count
+            elif count == info['_mode_count'] and normalized_type != info['_mode_type']:
+                info['_mode_type'] = next(t for t, c in types.items() if c == count)
         
         # 记录描述
-        for key in ['描述', 'description', 'Description', '说明']:
-            if key in param:
-                desc = param[key]
-                if desc and desc != '-':
-                    self.fields[canonical]['descriptions'].append(desc)
-                break
+        desc_key = _first_key(param, DESC_KEYS)
+        if desc_key:
+            desc = param[desc_key]
+            if desc and desc != '-':
+                info['descriptions'].add(desc)
     
     def save_mapping(self):
         """保存映射关系"""
         # 1. 保存完整的 JSON 映射
         mapping_data = {
             'version': '2.0',
-            'generated_at': pd.Timestamp.now().isoformat(),
+            'generated_at': datetime.now().isoformat(),
             'interfaces': self.interfaces,
             'fields': {},
-            'field_to_interfaces': {k: list(v) for k, v in self.field_to_interfaces.items()},
+            # 接口集合在序列化时由 default=list 直接转为数组，不再预先复制一遍
+            'field_to_interfaces': self.field_to_interfaces,
             'interface_to_fields': self.interface_to_fields,
         }
         
@@ -374,14 +462,13 @@ class FieldMapper:
                 'interfaces': sorted(list(info['interfaces'])),
                 'input_interfaces': sorted(info['input_interfaces']),
                 'output_interfaces': sorted(info['output_interfaces']),
-                'common_type': info['types'].most_common(1)[0][0] if info['types'] else 'string',
+                'common_type': info['_mode_type'],
                 'all_types': dict(info['types']),
-                'descriptions': list(set(info['descriptions']))[:10],
+                'descriptions': list(info['descriptions'])[:10],
             }
         
         json_path = os.path.join(self.output_dir, 'complete_field_mapping.json')
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(mapping_data, f, ensure_ascii=False, indent=2)
+        dump_json(mapping_data, json_path, default=list)
         print(f"✓ 完整映射已保存到: {json_path}")
         
         # 2. 保存字段查询表（CSV）
@@ -390,17 +477,16 @@ class FieldMapper:
             field_list.append({
                 '标准字段名': canonical,
                 '别名': '|'.join(sorted(list(info['aliases'] - {canonical}))),
-                '常见类型': info['types'].most_common(1)[0][0] if info['types'] else 'string',
+                '常见类型': info['_mode_type'],
                 '可从接口获取': len(info['output_interfaces']),
                 '输出接口示例': '|'.join(sorted(info['output_interfaces'][:10])),
                 '可用于接口参数': len(info['input_interfaces']),
                 '输入接口示例': '|'.join(sorted(info['input_interfaces'][:10])),
             })
         
-        field_df = pd.DataFrame(field_list)
-        field_df = field_df.sort_values('可从接口获取', ascending=False)
+        field_list.sort(key=lambda row: row['可从接口获取'], reverse=True)
         field_csv = os.path.join(self.output_dir, 'field_query_table.csv')
-        field_df.to_csv(field_csv, index=False, encoding='utf-8-sig')
+        _write_csv(field_csv, FIELD_TABLE_COLUMNS, field_list)
         print(f"✓ 字段查询表已保存到: {field_csv}")
         
         # 3. 保存接口查询表（CSV）
@@ -419,10 +505,9 @@ class FieldMapper:
                 '输出字段': '|'.join(output_fields[:20]),
             })
         
-        interface_df = pd.DataFrame(interface_list)
-        interface_df = interface_df.sort_values(['数据类型', '接口名'])
+        interface_list.sort(key=lambda row: (row['数据类型'], row['接口名']))
         interface_csv = os.path.join(self.output_dir, 'interface_query_table.csv')
-        interface_df.to_csv(interface_csv, index=False, encoding='utf-8-sig')
+        _write_csv(interface_csv, INTERFACE_TABLE_COLUMNS, interface_list)
         print(f"✓ 接口查询表已保存到: {interface_csv}")
         
         return mapping_data
@@ -469,17 +554,29 @@ class FieldQueryTool:
     def __init__(self, mapping_file: str = "result/complete_field_mapping.json"):
         self.mapping_file = mapping_file
         self.mapping_data = None
+        self._field_index = {}  # 标准名/别名 -> 标准名
+        self._lower_fields = []  # 按标准名排序的 (小写标准名, 标准名)，用于相似字段查找
         self._load_mapping()
     
     def _load_mapping(self):
         """加载映射数据"""
-        if os.path.exists(self.mapping_file):
-            with open(self.mapping_file, 'r', encoding='utf-8') as f:
-                self.mapping_data = json.load(f)
+        # 与其他调用方共用解析结果，文件未改动时不重复读取
+        self.mapping_data = load_json_cached(self.mapping_file)
+        if self.mapping_data is not None:
+            self._build_field_index()
             print(f"✓ 已加载映射数据: {self.mapping_file}")
         else:
             print(f"✗ 映射文件不存在: {self.mapping_file}")
     
+    def _build_field_index(self):
+        """构建字段查找表；同一名称出现在多个字段下时保留先出现的"""
+        fields = self.mapping_data.get('fields', {})
+        for canonical, info in fields.items():
+            self._field_index.setdefault(canonical, canonical)
+            for alias in info.get('aliases', []):
+                self._field_index.setdefault(alias, canonical)
+        self._lower_fields = [(canonical.lower(), canonical) for canonical in sorted(fields)]
+    
     def find_interfaces_for_field(self, field_name: str, show_detail: bool = True):
         """查找可以提供指定字段的接口"""
         if not self.mapping_data:
@@ -489,17 +586,14 @@ class FieldQueryTool:
         fields = self.mapping_data.get('fields', {})
         
         # 查找匹配的字段
-        matched_canonical = None
-        for canonical, info in fields.items():
-            if field_name == canonical or field_name in info.get('aliases', []):
-                matched_canonical = canonical
-                break
+        matched_canonical = self._field_index.get(field_name)
         
         if not matched_canonical:
             print(f"未找到字段: {field_name}")
             print("\n相似字段:")
-            for canonical in sorted(fields.keys()):
-                if field_name.lower() in canonical.lower():
+            needle = field_name.lower()
+            for lowered, canonical in self._lower_fields:
+                if needle in lowered:
                     print(f"  - {canonical}")
             return
         
@@ -9,16 +9,56 @@ AKShare 数据接口文档解析器
 import re
 import os
 import pandas as pd
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional
+
+# 接口信息（接口/目标地址/描述）
+_API_RE = re.compile(r'接口:\s*(.+?)\n目标地址:\s*(.+?)\n描述:\s*(.+?)\n', re.DOTALL)
+# 接口基本信息，含可选的限量行
+_INFO_RE = re.compile(
+    r"接口:\s*(.+?)\s*\n"
+    r"目标地址:\s*(.*?)\s*\n"
+    r"描述:\s*(.+?)\s*\n"
+    r"(?:限量:\s*(.*?)\s*\n)?"
+)
+# 紧跟在描述行之后的限量行，从描述行末尾的换行处开始匹配，与 _INFO_RE 的末尾部分一致
+_LIMIT_RE = re.compile(r"\s*\n限量:\s*(.*?)\s*\n")
+# markdown标题；写成 #[#]* 而不是 #+，让re引擎得到字面前缀'#'，直接跳到候选位置而不是逐字符尝试
+_TITLE_RE = re.compile(r'(#[#]*\s+)(.+?)(?=\n|$)')
+# 数据示例代码块
+_DATA_EXAMPLE_RE = re.compile(r"数据示例\n```(.+?)```", re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _table_re(table_name: str) -> re.Pattern:
+    """表名后紧跟的参数表格：表头行、分隔行、数据行"""
+    return re.compile(
+        rf"{table_name}\s*\n"
+        r"\|(.+)\|\s*\n"   # 表头行
+        r"\|([\-:]+\|)+\s*\n"  # 分隔行
+        r"((?:\|.+\|\s*\n)+)"  # 数据行
+    )
+
 
 class DataInterfaceParser:
     def __init__(self, data_dir: str = "data", output_dir: str = "result/data_dictionaries"):
         self.data_dir = data_dir
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        
+        # 解析结果缓存，文件未变化时不再重复读取和解析
+        self._file_cache = {}  # 文件路径 -> ((修改时间, 大小), 接口记录列表)
+        self._cached_key = None  # 上次解析时各文件的 (文件名, 修改时间, 大小)
+        self._cached_df = None
     
-    def parse_single_file(self, file_path: str) -> pd.DataFrame:
+    @staticmethod
+    def parse_single_file(file_path: str) -> pd.DataFrame:
         """解析单个Markdown数据文档"""
+        return pd.DataFrame(DataInterfaceParser._parse_records(file_path))
+    
+    @staticmethod
+    def _parse_records(file_path: str) -> List[Dict]:
+        """解析单个Markdown数据文档，返回接口记录列表"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -26,13 +66,12 @@ class DataInterfaceParser:
             interfaces = []
             
             # 为了准确识别API接口部分，我们特别查找包含"接口:"的段落
-            api_pattern = r'接口:\s*(.+?)\n目标地址:\s*(.+?)\n描述:\s*(.+?)\n'
-            api_matches = re.finditer(api_pattern, content, re.DOTALL)
+            # 一次扫描取得全部接口位置，下一个接口的起点即本段落的终点
+            api_matches = list(_API_RE.finditer(content))
             
-            for match in api_matches:
+            for idx, match in enumerate(api_matches):
                 # 找到API接口的位置
                 api_start = match.start()
-                api_end = match.end()
                 
                 # 找到这个API接口所在的完整段落
                 section_start = content.rfind('\n', 0, api_start)
@@ -41,32 +80,25 @@ class DataInterfaceParser:
                 else:
                     section_start += 1
                     
-                # 找到下一个API接口或文件结尾
-                section_end = len(content)
-                next_api_match = re.search(api_pattern, content[api_end:], re.DOTALL)
-                if next_api_match:
-                    section_end = api_end + next_api_match.start()
-                
-                # 截取这一段内容
-                section_content = content[section_start:section_end]
+                # 找到下一个API接口或文件结尾；段落即 content[section_start:section_end]，以下各项提取直接按位置查找，不复制子串
+                section_end = api_matches[idx + 1].start() if idx + 1 < len(api_matches) else len(content)
                 
                 # 提取接口描述信息
-                func_info = self._extract_interface_info(section_content)
+                func_info = DataInterfaceParser._extract_interface_info(content, section_start, section_end, match)
                 if not func_info:
                     continue
                     
                 # 提取输入参数表
-                input_params = self._parse_parameter_table(section_content, "输入参数")
+                input_params = DataInterfaceParser._parse_parameter_table(content, "输入参数", section_start, section_end)
                 # 提取输出参数表
-                output_params = self._parse_parameter_table(section_content, "输出参数")
+                output_params = DataInterfaceParser._parse_parameter_table(content, "输出参数", section_start, section_end)
                 # 提取数据示例
-                data_example, total_lines = self._extract_data_example(section_content)
+                data_example, total_lines = DataInterfaceParser._extract_data_example(content, section_start, section_end)
                 
                 # 尝试找到标题
                 title = "未知接口"
                 # 查找最近的标题（从当前段落开始向上查找）
-                title_pattern = r'(#+\s+)(.+?)(?=\n|$)'
-                title_match = re.search(title_pattern, section_content)
+                title_match = _TITLE_RE.search(content, section_start, section_end)
                 if title_match:
                     title = title_match.group(2).strip()
                 
@@ -80,20 +112,36 @@ class DataInterfaceParser:
                 }
                 interfaces.append(interface)
             
-            return pd.DataFrame(interfaces)
+            return interfaces
         except Exception as e:
             print(f"解析文件 {file_path} 时出错: {str(e)}")
-            return pd.DataFrame()
+            return []
     
-    def _extract_interface_info(self, section: str) -> Dict:
-        """提取接口基本信息"""
-        pattern = (
-            r"接口:\s*(.+?)\s*\n"
-            r"目标地址:\s*(.*?)\s*\n"
-            r"描述:\s*(.+?)\s*\n"
-            r"(?:限量:\s*(.*?)\s*\n)?"
-        )
-        match = re.search(pattern, section)
+    @staticmethod
+    def _extract_interface_info(section: str, start: int = 0, end: Optional[int] = None,
+                                api_match: Optional[re.Match] = None) -> Dict:
+        """
+        提取接口基本信息，只在 section[start:end] 内查找
+        
+        api_match 为调用方已得到的 _API_RE 匹配：其三项都在单行内且段落中在它之前没有其他"接口:"时，
+        结果与重新匹配相同，直接取用，只需再检查限量行
+        """
+        if end is None:
+            end = len(section)
+        
+        if (api_match is not None and '\n' not in ''.join(api_match.groups())
+                and section.find('接口:', start, api_match.start()) < 0):
+            info = {
+                "func_name": api_match.group(1).strip(),
+                "target_url": api_match.group(2).strip(),
+                "description": api_match.group(3).strip()
+            }
+            limit_match = _LIMIT_RE.match(section, api_match.end() - 1, end)
+            if limit_match and limit_match.group(1):
+                info['limit'] = limit_match.group(1).strip()
+            return info
+        
+        match = _INFO_RE.search(section, start, end)
         if not match:
             return None
             
@@ -106,37 +154,47 @@ class DataInterfaceParser:
             info['limit'] = match.group(4).strip()
         return info
     
-    def _parse_parameter_table(self, section: str, table_name: str) -> List[Dict]:
-        """解析参数表格，适配AKShare文档格式"""
+    @staticmethod
+    def _parse_parameter_table(section: str, table_name: str, start: int = 0, end: Optional[int] = None) -> List[Dict]:
+        """解析参数表格，适配AKShare文档格式，只在 section[start:end] 内查找"""
+        if end is None:
+            end = len(section)
+        
+        # 表格必然从表名处开始：先用子串查找定位，没有表名时不运行正则，有则从该处开始匹配
+        start = section.find(table_name, start, end)
+        if start < 0:
+            return []
+        
         # 匹配表格标题、表头和数据行
-        pattern = (
-            rf"{table_name}\s*\n"
-            r"\|(.+)\|\s*\n"   # 表头行
-            r"\|([\-:]+\|)+\s*\n"  # 分隔行
-            r"((?:\|.+\|\s*\n)+)"  # 数据行
-        )
-        match = re.search(pattern, section)
+        match = _table_re(table_name).search(section, start, end)
         if not match:
             return []
             
         # 解析表头
         headers = [h.strip() for h in match.group(1).split('|') if h.strip()]
         
-        # 解析数据行
+        # 解析数据行：单元格数 = 竖线数 - 1，数量与表头不符的行（含空行）不必拆分
         rows = []
-        for row in match.group(3).strip().split('\n'):
-            if not row.strip() or '|---' in row:
+        pipe_count = len(headers) + 1
+        for row in match.group(3).split('\n'):
+            if row.count('|') != pipe_count or '|---' in row:
                 continue
-            cells = [c.strip() for c in row.split('|')[1:-1]]
-            if len(cells) == len(headers):
-                rows.append(dict(zip(headers, cells)))
+            rows.append(dict(zip(headers, [c.strip() for c in row.split('|')[1:-1]])))
                 
         return rows
     
-    def _extract_data_example(self, section: str) -> Tuple[str, int]:
-        """提取数据示例并计算行数"""
-        pattern = r"数据示例\n```(.+?)```"
-        match = re.search(pattern, section, re.DOTALL)
+    @staticmethod
+    def _extract_data_example(section: str, start: int = 0, end: Optional[int] = None) -> Tuple[str, int]:
+        """提取数据示例并计算行数，只在 section[start:end] 内查找"""
+        if end is None:
+            end = len(section)
+        
+        # 没有"数据示例"标记的片段不运行DOTALL正则，有则从标记处开始匹配
+        start = section.find("数据示例", start, end)
+        if start < 0:
+            return None, 0
+        
+        match = _DATA_EXAMPLE_RE.search(section, start, end)
         if not match:
             return None, 0
             
@@ -145,34 +203,50 @@ class DataInterfaceParser:
         return data_str, len(lines)
     
     def parse_all_files(self) -> pd.DataFrame:
-        """解析所有数据文件"""
+        """解析所有数据文件；所有文件均未变化时直接返回上次的结果（调用方不应修改）"""
+        with os.scandir(self.data_dir) as it:
+            entries = sorted((entry for entry in it if entry.name.endswith('.md.txt')), key=lambda e: e.name)
+        stats = [entry.stat() for entry in entries]
+        key = tuple((entry.name, st.st_mtime_ns, st.st_size) for entry, st in zip(entries, stats))
+        if key == self._cached_key:
+            return self._cached_df
+        
         all_data = []
-        total_interfaces = 0
+        parsed_files = 0
         
         print("开始解析所有数据文件...")
         
-        for fname in sorted(os.listdir(self.data_dir)):
-            if fname.endswith('.md.txt'):
-                file_path = os.path.join(self.data_dir, fname)
-                try:
-                    df = self.parse_single_file(file_path)
-                    if not df.empty:
-                        all_data.append(df)
-                        total_interfaces += len(df)
-                        print(f"✓ 成功解析: {fname} ({len(df)}个接口)")
-                    else:
-                        print(f"○ 未发现接口: {fname}")
-                except Exception as e:
-                    print(f"✗ 解析 {fname} 失败: {str(e)}")
-                    continue
+        for entry, st in zip(entries, stats):
+            fname = entry.name
+            try:
+                file_key = (st.st_mtime_ns, st.st_size)
+                cached = self._file_cache.get(entry.path)
+                if cached is not None and cached[0] == file_key:
+                    records = cached[1]
+                else:
+                    records = self._parse_records(entry.path)
+                    self._file_cache[entry.path] = (file_key, records)
+                if records:
+                    all_data.extend(records)
+                    parsed_files += 1
+                    print(f"✓ 成功解析: {fname} ({len(records)}个接口)")
+                else:
+                    print(f"○ 未发现接口: {fname}")
+            except Exception as e:
+                print(f"✗ 解析 {fname} 失败: {str(e)}")
+                continue
         
         if all_data:
-            result_df = pd.concat(all_data, ignore_index=True)
-            print(f"\n总计: 成功解析 {len(all_data)} 个文件，共 {total_interfaces} 个接口")
-            return result_df
+            # 所有文件的记录汇总后一次构造DataFrame，不再逐文件构造再拼接
+            result_df = pd.DataFrame(all_data)
+            print(f"\n总计: 成功解析 {parsed_files} 个文件，共 {len(all_data)} 个接口")
         else:
             print("警告: 没有成功解析任何文件")
-            return pd.DataFrame()
+            result_df = pd.DataFrame()
+        
+        self._cached_df = result_df
+        self._cached_key = key
+        return result_df
     
     def save_to_csv(self, filename: str = "all_data_dictionary.csv") -> str:
         """将解析结果保存为CSV文件"""
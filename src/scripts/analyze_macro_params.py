@@ -8,6 +8,7 @@ import akshare as ak
 import pandas as pd
 from datetime import datetime, timedelta
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 warnings.filterwarnings('ignore')
 
 def analyze_column_values(df, column_name):
@@ -15,14 +16,17 @@ def analyze_column_values(df, column_name):
     if column_name not in df.columns:
         return None
     
-    col_data = df[column_name].dropna()
-    if len(col_data) == 0:
+    # 不复制去空后的整列：计数用count()，空值只从去重结果中剔除，数值统计本身跳过空值
+    col_data = df[column_name]
+    total = int(col_data.count())
+    if total == 0:
         return {"total": 0, "unique_count": 0}
     
     unique_values = col_data.unique()
+    unique_values = unique_values[pd.notna(unique_values)]
     
     result = {
-        "total": len(col_data),
+        "total": total,
         "unique_count": len(unique_values),
         "dtype": str(col_data.dtype),
     }
@@ -38,9 +42,10 @@ def analyze_column_values(df, column_name):
     elif col_data.dtype in ['int64', 'float64']:
         # 数值类型
         result["type"] = "numeric"
-        result["min"] = float(col_data.min()) if pd.notna(col_data.min()) else None
-        result["max"] = float(col_data.max()) if pd.notna(col_data.max()) else None
-        result["mean"] = float(col_data.mean()) if pd.notna(col_data.mean()) else None
+        # 有空值时先去空一次，避免三次统计各自处理空值；每个统计量只计算一次
+        values = col_data.dropna() if total < len(col_data) else col_data
+        for stat_name, value in (("min", values.min()), ("max", values.max()), ("mean", values.mean())):
+            result[stat_name] = float(value) if pd.notna(value) else None
         
         # 检查是否为日期格式
         if 'date' in column_name.lower() or 'time' in column_name.lower() or '月' in column_name:
@@ -99,35 +104,39 @@ def test_macro_interfaces():
     
     results = {}
     
-    for name, func in interfaces_to_test:
-        try:
-            df = func()
-            print(f"\n{'='*60}")
-            print(f"接口: {name}")
-            print(f"数据形状: {df.shape}")
-            print(f"列名: {list(df.columns)}")
+    # 各接口的请求互不依赖，先全部并发发出；按原顺序取结果，输出顺序不变，
+    # 前面接口的列分析与后面接口的网络请求重叠进行
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [(name, executor.submit(func)) for name, func in interfaces_to_test]
+        for name, future in futures:
+            try:
+                df = future.result()
+                print(f"\n{'='*60}")
+                print(f"接口: {name}")
+                print(f"数据形状: {df.shape}")
+                print(f"列名: {list(df.columns)}")
             
-            results[name] = {
-                "shape": df.shape,
-                "columns": list(df.columns),
-                "column_analysis": {}
-            }
+                results[name] = {
+                    "shape": df.shape,
+                    "columns": list(df.columns),
+                    "column_analysis": {}
+                }
             
-            # 分析每列的取值
-            for col in df.columns:
-                analysis = analyze_column_values(df, col)
-                if analysis:
-                    results[name]["column_analysis"][col] = analysis
-                    print(f"\n  {col}:")
-                    print(f"    - 类型: {analysis.get('type', 'unknown')}")
-                    if analysis.get('type') == 'numeric':
-                        print(f"    - 范围: {analysis.get('min')} 至 {analysis.get('max')}")
-                    elif analysis.get('type') == 'string':
-                        print(f"    - 唯一值数量: {analysis.get('unique_count')}")
-                        print(f"    - 示例值: {analysis.get('sample_values', [])[:5]}")
+                # 分析每列的取值
+                for col in df.columns:
+                    analysis = analyze_column_values(df, col)
+                    if analysis:
+                        results[name]["column_analysis"][col] = analysis
+                        print(f"\n  {col}:")
+                        print(f"    - 类型: {analysis.get('type', 'unknown')}")
+                        if analysis.get('type') == 'numeric':
+                            print(f"    - 范围: {analysis.get('min')} 至 {analysis.get('max')}")
+                        elif analysis.get('type') == 'string':
+                            print(f"    - 唯一值数量: {analysis.get('unique_count')}")
+                            print(f"    - 示例值: {analysis.get('sample_values', [])[:5]}")
                         
-        except Exception as e:
-            print(f"\n接口 {name} 出错: {e}")
+            except Exception as e:
+                print(f"\n接口 {name} 出错: {e}")
     
     return results
 
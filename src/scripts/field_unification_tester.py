@@ -5,10 +5,11 @@
 测试不同接口返回字段的统一化映射
 """
 
-import json
 import os
 import sys
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 # 添加src目录到路径
@@ -16,9 +17,49 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from mappers.field_mapper import FieldMapper
 from formatters.field_formatter import FieldFormatter
+from utils.common import dump_json, load_json
 from interface_response_analyzer import InterfaceResponseAnalyzer
 
 
+# 值类型 -> 字段名关键字，按优先级排列（先代码、再日期、最后数值）
+_VALUE_TYPE_KEYWORDS = (
+    ('code', ('symbol', 'code', 'stock', 'bond', 'fund', 'index')),
+    ('date', ('date', 'time', 'year', 'month')),
+    ('float', ('price', 'amount', 'value', 'rate', 'percent')),
+)
+
+# 值类型 -> 标准化函数；数值只转换字符串
+_VALUE_NORMALIZERS = {
+    'code': FieldFormatter.normalize_stock_code,
+    'date': FieldFormatter.normalize_date,
+    'float': lambda value: FieldFormatter.normalize_float(value) if isinstance(value, str) else value,
+}
+
+
+def _column_values(df: pd.DataFrame, i: int) -> List[Any]:
+    """
+    取第i列的值，标量类型与 to_dict('records') 相同：
+    object/扩展类型列中的numpy标量转为Python标量，缺失值pd.NA转为None（NaN/NaT保持不变）
+    """
+    values = list(df.iloc[:, i])
+    dtype = df.dtypes.iloc[i]
+    if dtype == object or isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        values = [None if value is pd.NA
+                  else value.item() if isinstance(value, np.generic) and not isinstance(value, (np.datetime64, np.timedelta64))
+                  else value for value in values]
+    return values
+
+
+@lru_cache(maxsize=4096)
+def _classify_field(field: str) -> Optional[str]:
+    """根据标准字段名判断值类型，同一字段名只判断一次，无法判断时返回None"""
+    field_lower = field.lower()
+    for kind, keywords in _VALUE_TYPE_KEYWORDS:
+        if any(keyword in field_lower for keyword in keywords):
+            return kind
+    return None
+
+
 class FieldUnificationTester:
     """字段统一化测试器"""
     
@@ -26,14 +67,36 @@ class FieldUnificationTester:
         self.analysis_dir = analysis_dir
         self.field_mapper = FieldMapper()
         self.unified_schema = None
+        self._equivalent_index, self._standard_index = self._build_standard_index()
+        # 记录的字段名序列 -> 每个字段的 (标准字段, 标准化函数)，同一接口的样例通常字段相同
+        self._keyset_cache: Dict[Tuple[str, ...], Tuple[Tuple[str, Any], ...]] = {}
+        self._standard_field_cache: Dict[str, str] = {}  # 原字段名 -> 标准字段
+    
+    def _build_standard_index(self):
+        """
+        构建字段等价关系的查找表
+        
+        Returns:
+            (等价字段名 -> (序号, 标准字段), 小写标准字段名 -> (序号, 标准字段))，
+            序号为标准字段的定义顺序，同名时保留靠前者
+        """
+        equivalent_index = {}
+        standard_index = {}
+        for order, (standard_field, equivalents) in enumerate(self.field_mapper.field_equivalents.items()):
+            standard_index.setdefault(standard_field.lower(), (order, standard_field))
+            for equivalent in equivalents:
+                equivalent_index.setdefault(equivalent, (order, standard_field))
+        return equivalent_index, standard_index
     
     def load_unified_schema(self) -> Dict[str, Any]:
         """加载统一模式"""
         schema_file = os.path.join(self.analysis_dir, 'unified_schema.json')
         if os.path.exists(schema_file):
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                self.unified_schema = json.load(f)
-                return self.unified_schema
+            self.unified_schema = load_json(schema_file)
+            # 字段映射随统一模式变化
+            self._keyset_cache.clear()
+            self._standard_field_cache.clear()
+            return self.unified_schema
         return {}
     
     def unify_interface_response(self, api_name: str, response: Any) -> Dict[str, Any]:
@@ -41,15 +104,20 @@ class FieldUnificationTester:
         unified = {}
         
         if isinstance(response, pd.DataFrame):
-            # 转换DataFrame为字典列表
-            records = response.to_dict('records')
-            unified_records = []
-            
-            for record in records:
-                unified_record = self._unify_record(record)
-                unified_records.append(unified_record)
+            # 按列处理：每列只映射一次字段名、确定一次标准化函数，再组装为记录；
+            # 多列映射到同一标准字段时与逐条处理一致，位置取先出现的列，值取后出现的列
+            columns = {}
+            for i, field in enumerate(response.columns):
+                standard_field = self._map_to_standard_field(field)
+                if standard_field:
+                    columns[standard_field] = self._normalize_column(standard_field, _column_values(response, i))
             
-            unified['data'] = unified_records
+            if len(response.columns) == 0:
+                unified['data'] = []
+            elif columns:
+                unified['data'] = [dict(zip(columns, values)) for values in zip(*columns.values())]
+            else:
+                unified['data'] = [{} for _ in range(len(response))]
             unified['type'] = 'DataFrame'
         
         elif isinstance(response, dict):
@@ -62,48 +130,54 @@ class FieldUnificationTester:
         """统一单条记录"""
         unified = {}
         
-        for field, value in record.items():
-            # 映射到标准字段
-            standard_field = self._map_to_standard_field(field)
+        # 字段名序列相同的记录复用同一份字段映射
+        keys = tuple(record)
+        plan = self._keyset_cache.get(keys)
+        if plan is None:
+            plan = tuple((standard_field, _VALUE_NORMALIZERS.get(_classify_field(standard_field)) if standard_field else None)
+                         for standard_field in map(self._map_to_standard_field, keys))
+            self._keyset_cache[keys] = plan
+        
+        for (standard_field, normalizer), value in zip(plan, record.values()):
             if standard_field:
-                # 标准化值
-                normalized_value = self._normalize_value(standard_field, value)
-                unified[standard_field] = normalized_value
+                unified[standard_field] = normalizer(value) if normalizer is not None else value
         
         return unified
     
+    def _normalize_column(self, field: str, values: List[Any]) -> List[Any]:
+        """标准化一列值，与逐个调用 _normalize_value 结果相同"""
+        normalizer = _VALUE_NORMALIZERS.get(_classify_field(field))
+        if normalizer is None:
+            return values
+        return [normalizer(value) for value in values]
+    
     def _map_to_standard_field(self, field: str) -> str:
-        """映射到标准字段"""
+        """映射到标准字段，同一字段名只解析一次"""
+        standard_field = self._standard_field_cache.get(field)
+        if standard_field is None:
+            standard_field = self._standard_field_cache[field] = self._resolve_standard_field(field)
+        return standard_field
+    
+    def _resolve_standard_field(self, field: str) -> str:
+        """按统一模式、字段等价关系的顺序查找标准字段"""
         # 先从统一模式中查找
         if self.unified_schema and 'field_mappings' in self.unified_schema:
             return self.unified_schema['field_mappings'].get(field, field)
         
-        # 再从字段等价关系中查找
-        for standard_field, equivalents in self.field_mapper.field_equivalents.items():
-            if field in equivalents or field.lower() == standard_field.lower():
-                return standard_field
+        # 再从字段等价关系中查找：等价字段精确匹配或标准字段忽略大小写匹配，取定义顺序靠前者
+        hits = [hit for hit in (self._equivalent_index.get(field), self._standard_index.get(field.lower())) if hit]
+        if hits:
+            return min(hits)[1]
         
         # 如果找不到，返回原字段
         return field
     
     def _normalize_value(self, field: str, value: Any) -> Any:
-        """标准化值"""
-        field_lower = field.lower()
-        
-        # 股票代码标准化
-        if any(keyword in field_lower for keyword in ['symbol', 'code', 'stock', 'bond', 'fund', 'index']):
-            return FieldFormatter.normalize_stock_code(value)
-        
-        # 日期标准化
-        elif any(keyword in field_lower for keyword in ['date', 'time', 'year', 'month']):
-            return FieldFormatter.normalize_date(value)
-        
-        # 数值标准化
-        elif any(keyword in field_lower for keyword in ['price', 'amount', 'value', 'rate', 'percent']):
-            if isinstance(value, str):
-                return FieldFormatter.normalize_float(value)
-        
-        return value
+        """标准化值：按字段类型选择股票代码/日期/数值标准化，其他字段原样返回"""
+        normalizer = _VALUE_NORMALIZERS.get(_classify_field(field))
+        if normalizer is None:
+            return value
+        return normalizer(value)
     
     def test_field_unification(self, limit: int = 10):
         """测试字段统一化"""
@@ -123,8 +197,7 @@ class FieldUnificationTester:
             print("响应样例文件不存在")
             return
         
-        with open(samples_file, 'r', encoding='utf-8') as f:
-            samples = json.load(f)
+        samples = load_json(samples_file)
         
         print(f"开始测试字段统一化，共 {len(samples)} 个接口...")
         
@@ -140,15 +213,15 @@ class FieldUnificationTester:
             
             # 模拟统一化处理
             if sample['sample_data']:
-                unified_data = []
+                # 统一化的同时汇总出现过的统一字段，不再对结果二次遍历
+                unified_fields = set()
                 for record in sample['sample_data']:
-                    unified_record = self._unify_record(record)
-                    unified_data.append(unified_record)
+                    unified_fields.update(self._unify_record(record))
                 
                 test_results[api_name] = {
                     'original_fields': sample['fields'],
-                    'unified_fields': list(set(k for record in unified_data for k in record.keys())),
-                    'sample_count': len(unified_data)
+                    'unified_fields': list(unified_fields),
+                    'sample_count': len(sample['sample_data'])
                 }
                 
                 # 统计字段
@@ -170,14 +243,14 @@ class FieldUnificationTester:
     def _save_test_results(self, test_results: Dict[str, Any], field_statistics: Dict[str, int]):
         """保存测试结果"""
         # 保存测试结果
-        with open(os.path.join(self.analysis_dir, 'field_unification_test.json'), 'w', encoding='utf-8') as f:
-            json.dump(test_results, f, ensure_ascii=False, indent=2)
+        dump_json(test_results, os.path.join(self.analysis_dir, 'field_unification_test.json'))
         
         # 保存字段统计
-        field_stats_df = pd.DataFrame([
-            {'field': field, 'count': count}
-            for field, count in field_statistics.items()
-        ]).sort_values('count', ascending=False)
+        field_stats_df = pd.DataFrame({
+            'field': list(field_statistics),
+            'count': list(field_statistics.values()),
+        })
+        field_stats_df.sort_values('count', ascending=False, inplace=True)
         
         field_stats_df.to_csv(
             os.path.join(self.analysis_dir, 'field_statistics.csv'), 
@@ -186,16 +259,14 @@ class FieldUnificationTester:
         )
         
         # 保存接口统一化结果
-        test_results_df = pd.DataFrame([
-            {
-                'api_name': api_name,
-                'original_field_count': len(info['original_fields']),
-                'unified_field_count': len(info['unified_fields']),
-                'sample_count': info['sample_count'],
-                'unified_fields': ', '.join(info['unified_fields'][:10])
-            }
-            for api_name, info in test_results.items()
-        ])
+        infos = test_results.values()
+        test_results_df = pd.DataFrame({
+            'api_name': list(test_results),
+            'original_field_count': [len(info['original_fields']) for info in infos],
+            'unified_field_count': [len(info['unified_fields']) for info in infos],
+            'sample_count': [info['sample_count'] for info in infos],
+            'unified_fields': [', '.join(info['unified_fields'][:10]) for info in infos],
+        })
         
         test_results_df.to_csv(
             os.path.join(self.analysis_dir, 'unification_test_results.csv'), 
@@ -221,8 +292,7 @@ class FieldUnificationTester:
             'summary': f"识别了 {len(field_statistics)} 个统一字段，其中前20个最常见字段覆盖了大部分接口"
         }
         
-        with open(os.path.join(self.analysis_dir, 'unified_field_report.json'), 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        dump_json(report, os.path.join(self.analysis_dir, 'unified_field_report.json'))
     
     def verify_field_consistency(self):
         """验证字段一致性"""
@@ -232,8 +302,7 @@ class FieldUnificationTester:
             print("测试结果文件不存在，请先运行测试")
             return
         
-        with open(test_file, 'r', encoding='utf-8') as f:
-            test_results = json.load(f)
+        test_results = load_json(test_file)
         
         # 分析字段一致性
         all_fields = set()
@@ -265,8 +334,7 @@ class FieldUnificationTester:
             consistency_report['consistency_score'][field] = coverage
         
         # 保存一致性报告
-        with open(os.path.join(self.analysis_dir, 'field_consistency_report.json'), 'w', encoding='utf-8') as f:
-            json.dump(consistency_report, f, ensure_ascii=False, indent=2)
+        dump_json(consistency_report, os.path.join(self.analysis_dir, 'field_consistency_report.json'))
         
         # 输出一致性分析
         print("\n字段一致性分析:")
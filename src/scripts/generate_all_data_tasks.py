@@ -5,26 +5,58 @@
 从所有数据接口文档生成任务配置
 """
 
+import glob
+import hashlib
 import json
 import os
 import sys
+
+import pandas as pd
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.parsers.md_parser import DataInterfaceParser
+from src.parsers.md_parser import PARSER_VERSION, DataInterfaceParser
+
+CACHE_DIR = "result/cache"
+
+def _source_fingerprint(data_dir: str) -> str:
+    """根据解析器版本及文档文件的路径、修改时间和大小计算指纹"""
+    entries = [PARSER_VERSION]
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.md.txt'))):
+        st = os.stat(path)
+        entries.append((path, st.st_mtime_ns, st.st_size))
+    return hashlib.blake2b(str(entries).encode('utf-8'), digest_size=8).hexdigest()
+
+def load_parsed_interfaces(parser: DataInterfaceParser) -> pd.DataFrame:
+    """解析接口文档，文档未变化时直接读取上次的解析结果"""
+    cache_path = os.path.join(CACHE_DIR, f"data_dict_{_source_fingerprint(parser.data_dir)}.pkl")
+    if os.path.exists(cache_path):
+        print(f"文档未变化，使用缓存: {cache_path}")
+        return pd.read_pickle(cache_path)
+    
+    df = parser.parse_all_files()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    df.to_pickle(cache_path)
+    
+    # 清理指纹已过期的旧缓存
+    for path in glob.glob(os.path.join(CACHE_DIR, 'data_dict_*.pkl')):
+        if path != cache_path:
+            os.remove(path)
+    return df
 
 def generate_tasks_for_all_data():
     """为所有数据类型生成任务配置"""
     parser = DataInterfaceParser()
-    df = parser.parse_all_files()
+    df = load_parsed_interfaces(parser)
     
-    tasks = []
-    for _, row in df.iterrows():
-        task = {
-            "name": row['func_name'],
-            "table_name": row['func_name'],
-            "func_name": row['func_name'],
-            "description": row['description'],
-            "data_type": row['data_type'],
+    # 直接按列取值组装任务，不再先转换为逐行字典
+    tasks = [
+        {
+            "name": func_name,
+            "table_name": func_name,
+            "func_name": func_name,
+            "description": description,
+            "data_type": data_type,
             "frequency": "daily",  # 默认每天更新
             "primary_keys": ["日期"],
             "func_params": {},
@@ -32,7 +64,8 @@ def generate_tasks_for_all_data():
             "iterator_param": None,
             "date_params": None
         }
-        tasks.append(task)
+        for func_name, description, data_type in zip(df['func_name'], df['description'], df['data_type'])
+    ]
     
     # 保存到result目录
     os.makedirs("result", exist_ok=True)
@@ -6,62 +6,99 @@
 import re
 import json
 
+try:
+    import ahocorasick
+except ImportError:  # 可选依赖，未安装时逐个关键词匹配
+    ahocorasick = None
+
+_FUNC_NAME_RE = re.compile(r'macro_[a-zA-Z0-9_]+')
+
+# 关键词 -> 分类，按优先级排列（描述统一转小写后匹配）
+_CATEGORY_KEYWORDS = (
+    ('美国', '美国宏观'), ('usa', '美国宏观'), ('united states', '美国宏观'),
+    ('中国', '中国宏观'),
+    ('欧洲', '欧洲宏观'), ('euro', '欧洲宏观'),
+    ('德国', '德国宏观'), ('germany', '德国宏观'),
+    ('英国', '英国宏观'), ('uk', '英国宏观'), ('britain', '英国宏观'),
+    ('日本', '日本宏观'), ('japan', '日本宏观'),
+    ('加拿大', '加拿大宏观'), ('canada', '加拿大宏观'),
+    ('澳大利亚', '澳大利亚宏观'), ('australia', '澳大利亚宏观'),
+    ('瑞士', '瑞士宏观'), ('swiss', '瑞士宏观'), ('switzerland', '瑞士宏观'),
+)
+
+def _build_category_automaton():
+    """构建关键词的Aho-Corasick自动机，值为(优先级, 分类)"""
+    automaton = ahocorasick.Automaton()
+    for priority, (keyword, category) in enumerate(_CATEGORY_KEYWORDS):
+        automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+_CATEGORY_AUTOMATON = _build_category_automaton() if ahocorasick is not None else None
+
+def _classify(description):
+    """根据描述中的关键词确定分类"""
+    desc_lower = description.lower()
+    if _CATEGORY_AUTOMATON is not None:
+        # 一次扫描找出所有命中的关键词，取优先级最高的分类
+        hits = [value for _, value in _CATEGORY_AUTOMATON.iter(desc_lower)]
+        return min(hits)[1] if hits else "其他"
+    return next((category for keyword, category in _CATEGORY_KEYWORDS if keyword in desc_lower), "其他")
+
+def _make_interface(func_name, description):
+    """构造单个接口的任务配置"""
+    return {
+        "name": func_name,
+        "table_name": func_name,
+        "func_name": func_name,
+        "description": description,
+        "frequency": "monthly",
+        "primary_keys": ["日期"],
+        "func_params": {},
+        "iterator_sql": None,
+        "iterator_param": None,
+        "date_params": None,
+        "category": _classify(description)
+    }
+
+def iter_macro_interfaces(filename):
+    """逐行扫描markdown文件，依次产出接口配置
+
+    匹配 "接口: macro_xxx" / 空行 / "目标地址: ..." / 空行 / "描述: ..." 的序列，
+    内存占用与文件大小无关。
+    """
+    func_name = None
+    expect = None  # 期望的下一行: 'addr_gap', 'addr', 'desc_gap', 'desc'
+    
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            
+            if expect == 'addr_gap':
+                expect = 'addr' if not line.strip() else None
+            elif expect == 'addr':
+                if line.startswith('目标地址:'):
+                    expect = 'desc_gap'
+                elif line.strip():
+                    expect = None
+            elif expect == 'desc_gap':
+                expect = 'desc' if not line else None
+            elif expect == 'desc':
+                expect = None
+                if line.startswith('描述:') and line[3:].strip():
+                    # 清理描述
+                    yield _make_interface(func_name, line[3:].strip())
+                    continue
+            
+            if expect is None and line.startswith('接口:'):
+                name = line[3:].strip()
+                if _FUNC_NAME_RE.fullmatch(name):
+                    func_name = name
+                    expect = 'addr_gap'
+
 def parse_macro_md(filename):
     """解析markdown文件，提取所有接口信息"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    interfaces = []
-    
-    # 使用更精确的正则表达式
-    pattern = r'接口:\s*(macro_[a-zA-Z0-9_]+)\s*\n\n目标地址:[^\n]*\n\n描述:\s*([^\n]+)'
-    matches = re.findall(pattern, content)
-    
-    for func_name, description in matches:
-        # 清理描述
-        description = description.strip()
-        if description.endswith(' '):
-            description = description[:-1]
-        
-        # 提取分类
-        category = "其他"
-        desc_lower = description.lower()
-        
-        if '美国' in description or 'usa' in desc_lower or 'united states' in desc_lower:
-            category = "美国宏观"
-        elif '中国' in description:
-            category = "中国宏观"
-        elif '欧洲' in description or 'euro' in desc_lower:
-            category = "欧洲宏观"
-        elif '德国' in description or 'germany' in desc_lower:
-            category = "德国宏观"
-        elif '英国' in description or 'uk' in desc_lower or 'britain' in desc_lower:
-            category = "英国宏观"
-        elif '日本' in description or 'japan' in desc_lower:
-            category = "日本宏观"
-        elif '加拿大' in description or 'canada' in desc_lower:
-            category = "加拿大宏观"
-        elif '澳大利亚' in description or 'australia' in desc_lower:
-            category = "澳大利亚宏观"
-        elif '瑞士' in description or 'swiss' in desc_lower or 'switzerland' in desc_lower:
-            category = "瑞士宏观"
-        
-        interface = {
-            "name": func_name,
-            "table_name": func_name,
-            "func_name": func_name,
-            "description": description,
-            "frequency": "monthly",
-            "primary_keys": ["日期"],
-            "func_params": {},
-            "iterator_sql": None,
-            "iterator_param": None,
-            "date_params": None,
-            "category": category
-        }
-        interfaces.append(interface)
-    
-    return interfaces
+    return list(iter_macro_interfaces(filename))
 
 def main():
     # 从data目录读取macro.md.txt
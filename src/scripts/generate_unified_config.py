@@ -5,7 +5,6 @@
 从LLM分析结果生成完整的统一字段配置文件
 """
 
-import json
 import os
 import sys
 from datetime import datetime
@@ -14,6 +13,8 @@ from typing import Dict, List, Any
 # 添加src目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils.common import dump_json, load_json
+
 
 class UnifiedConfigGenerator:
     """统一配置生成器"""
@@ -35,16 +36,14 @@ class UnifiedConfigGenerator:
         }
         
         if os.path.exists(equivalence_file):
-            with open(equivalence_file, 'r', encoding='utf-8') as f:
-                result["equivalence"] = json.load(f)
+            result["equivalence"] = load_json(equivalence_file)
             print(f"  ✓ 已加载: {equivalence_file}")
         else:
             print(f"  ⚠  未找到: {equivalence_file}")
             print(f"     请使用 prompts/enhanced_field_equivalence_analysis.txt 进行LLM分析")
         
         if os.path.exists(coverage_file):
-            with open(coverage_file, 'r', encoding='utf-8') as f:
-                result["coverage"] = json.load(f)
+            result["coverage"] = load_json(coverage_file)
             print(f"  ✓ 已加载: {coverage_file}")
         else:
             print(f"  ⚠  未找到: {coverage_file}")
@@ -163,8 +162,7 @@ class UnifiedConfigGenerator:
         """保存配置文件"""
         output_path = os.path.join(self.config_dir, filename)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        dump_json(config, output_path)
         
         print(f"\n配置文件已保存到: {output_path}")
         print(f"  大小: {os.path.getsize(output_path)} 字节")
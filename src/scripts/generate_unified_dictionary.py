@@ -8,9 +8,31 @@
 import pandas as pd
 import json
 import os
+import sys
 from collections import defaultdict, Counter
 from typing import Dict, List, Set, Tuple
 
+# 添加src目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.common import dump_json
+
+try:
+    import pyarrow
+except ImportError:  # 可选依赖，未安装时使用pandas默认的C解析器
+    pyarrow = None
+
+# 构建字典时实际用到的列，其余列不解析
+_NORMALIZED_COLUMNS = ["参数名", "标准化参数名", "参数英文名", "类型", "参数类型", "接口名", "接口类型", "数据样例"]
+_WITH_EXAMPLES_COLUMNS = ["参数名", "参数英文名", "类型", "接口名", "数据样例"]
+
+
+def _str_column(df: pd.DataFrame, column: str, default: str = "") -> List[str]:
+    """按列取字符串值，缺失值以default代替（与逐行 str(v) if pd.notna(v) else default 相同）"""
+    series = df[column]
+    return [str(v) if present else default for v, present in zip(series.tolist(), series.notna().tolist())]
+
+
 class UnifiedDictionaryGenerator:
     def __init__(self, data_dir: str = "result/data", output_dir: str = "result"):
         self.data_dir = data_dir
@@ -75,20 +97,41 @@ class UnifiedDictionaryGenerator:
             "list": "array",
             "dict": "object",
         }
+        
+        self._exact_index, self._lower_index = self._build_equivalent_index()
+    
+    def _build_equivalent_index(self):
+        """
+        构建字段等价关系的查找表
+        
+        Returns:
+            (字段名 -> (序号, 标准名称), 小写等价字段名 -> (序号, 标准名称))，
+            序号为等价关系的定义顺序，同名时保留靠前者
+        """
+        exact_index = {}
+        lower_index = {}
+        for order, (canonical, equivalents) in enumerate(self.field_equivalents.items()):
+            exact_index.setdefault(canonical, (order, canonical))
+            for equivalent in equivalents:
+                exact_index.setdefault(equivalent, (order, canonical))
+                lower_index.setdefault(equivalent.lower(), (order, canonical))
+        return exact_index, lower_index
     
     def load_all_data(self) -> Dict[str, pd.DataFrame]:
         """加载所有数据字典文件"""
+        # 名称 -> (文件路径, 读取的列，None表示全部)
         data_files = {
-            "normalized": os.path.join(self.data_dir, "normalized_data_dictionary.csv"),
-            "all_with_examples": os.path.join(self.data_dir, "all_data_dictionary_with_examples.csv"),
-            "macro": os.path.join(self.data_dir, "macro_data_dictionary.csv"),
-            "macro_with_examples": os.path.join(self.data_dir, "macro_data_dictionary_with_examples.csv"),
+            "normalized": (os.path.join(self.data_dir, "normalized_data_dictionary.csv"), _NORMALIZED_COLUMNS),
+            "all_with_examples": (os.path.join(self.data_dir, "all_data_dictionary_with_examples.csv"), _WITH_EXAMPLES_COLUMNS),
+            "macro": (os.path.join(self.data_dir, "macro_data_dictionary.csv"), None),
+            "macro_with_examples": (os.path.join(self.data_dir, "macro_data_dictionary_with_examples.csv"), None),
         }
+        engine = "pyarrow" if pyarrow is not None else "c"
         
         dfs = {}
-        for name, path in data_files.items():
+        for name, (path, usecols) in data_files.items():
             if os.path.exists(path):
-                dfs[name] = pd.read_csv(path)
+                dfs[name] = pd.read_csv(path, usecols=usecols, engine=engine)
                 print(f"✓ 加载 {name}: {len(dfs[name])} 条记录")
         
         return dfs
@@ -97,12 +140,10 @@ class UnifiedDictionaryGenerator:
         """获取字段的标准名称"""
         field_name_lower = field_name.lower().strip()
         
-        # 检查预定义的等价关系
-        for canonical, equivalents in self.field_equivalents.items():
-            if field_name == canonical or field_name in equivalents:
-                return canonical
-            if field_name_lower in [e.lower() for e in equivalents]:
-                return canonical
+        # 检查预定义的等价关系：精确匹配或等价字段忽略大小写匹配，取定义顺序靠前者
+        hits = [hit for hit in (self._exact_index.get(field_name), self._lower_index.get(field_name_lower)) if hit]
+        if hits:
+            return min(hits)[1]
         
         # 检查是否为英文和中文的对应关系
         # 简单的启发式规则：如果字段名只有英文，尝试找中文对应
@@ -120,36 +161,39 @@ class UnifiedDictionaryGenerator:
         }
         
         # 字段收集
-        field_occurrences = defaultdict(list)
+        field_occurrences = Counter()  # 标准名称 -> 出现次数，键顺序即字段输出顺序
+        field_aliases = defaultdict(set)
+        field_english_names = defaultdict(set)
         field_types = defaultdict(Counter)
         field_interfaces = defaultdict(set)
-        field_samples = defaultdict(list)
+        field_samples = defaultdict(dict)  # 标准名称 -> {样例: None}，用作保序集合
         
         # 处理 normalized_data_dictionary.csv
         if "normalized" in dfs:
             df = dfs["normalized"]
-            for _, row in df.iterrows():
-                orig_name = str(row["参数名"]) if pd.notna(row["参数名"]) else ""
-                canonical_name = str(row["标准化参数名"]) if pd.notna(row["标准化参数名"]) else orig_name
-                eng_name = str(row["参数英文名"]) if pd.notna(row["参数英文名"]) else ""
-                field_type = str(row["类型"]) if pd.notna(row["类型"]) else "string"
-                param_type = str(row["参数类型"]) if pd.notna(row["参数类型"]) else "输出参数"
-                interface_name = str(row["接口名"]) if pd.notna(row["接口名"]) else ""
-                interface_type = str(row["接口类型"]) if pd.notna(row["接口类型"]) else ""
-                sample = str(row["数据样例"]) if pd.notna(row["数据样例"]) else ""
-                frequency = int(row["出现频次"]) if pd.notna(row["出现频次"]) else 1
-                
+            # 按列一次取出所有值，不再逐行构造Series
+            orig_names = _str_column(df, "参数名")
+            canonical_names = [
+                str(v) if pd.notna(v) else orig_name
+                for v, orig_name in zip(df["标准化参数名"].tolist(), orig_names)
+            ]
+            rows = zip(
+                orig_names,
+                canonical_names,
+                _str_column(df, "参数英文名"),
+                _str_column(df, "类型", "string"),
+                _str_column(df, "接口名"),
+                _str_column(df, "数据样例"),
+            )
+            for orig_name, canonical_name, eng_name, field_type, interface_name, sample in rows:
                 # 确定标准名称
                 final_canonical = self.get_canonical_name(canonical_name)
                 
-                # 记录字段信息
-                field_occurrences[final_canonical].append({
-                    "original_name": orig_name,
-                    "english_name": eng_name,
-                    "interface": interface_name,
-                    "interface_type": interface_type,
-                    "parameter_type": param_type,
-                })
+                # 记录字段信息：出现次数、原始名称、英文名
+                field_occurrences[final_canonical] += 1
+                field_aliases[final_canonical].add(orig_name)
+                if eng_name:
+                    field_english_names[final_canonical].add(eng_name)
                 
                 # 标准化类型
                 normalized_type = self.type_mapping.get(field_type.lower(), field_type.lower())
@@ -159,22 +203,23 @@ class UnifiedDictionaryGenerator:
                 if interface_name:
                     field_interfaces[final_canonical].add(interface_name)
                 
-                # 记录数据样例
-                if sample and sample != "nan" and sample != "":
-                    field_samples[final_canonical].append(sample)
+                # 记录数据样例（去重，按首次出现顺序最多保留10个）
+                if sample and sample != "nan":
+                    samples = field_samples[final_canonical]
+                    if len(samples) < 10:
+                        samples[sample] = None
         
         # 处理 all_data_dictionary_with_examples.csv
         if "all_with_examples" in dfs:
             df = dfs["all_with_examples"]
-            for _, row in df.iterrows():
-                orig_name = str(row["参数名"]) if pd.notna(row["参数名"]) else ""
-                eng_name = str(row["参数英文名"]) if pd.notna(row["参数英文名"]) else ""
-                field_type = str(row["类型"]) if pd.notna(row["类型"]) else "string"
-                param_type = str(row["参数类型"]) if pd.notna(row["参数类型"]) else "输出参数"
-                interface_name = str(row["接口名"]) if pd.notna(row["接口名"]) else ""
-                interface_type = str(row["接口类型"]) if pd.notna(row["接口类型"]) else ""
-                sample = str(row["数据样例"]) if pd.notna(row["数据样例"]) else ""
-                
+            rows = zip(
+                _str_column(df, "参数名"),
+                _str_column(df, "参数英文名"),
+                _str_column(df, "类型", "string"),
+                _str_column(df, "接口名"),
+                _str_column(df, "数据样例"),
+            )
+            for orig_name, eng_name, field_type, interface_name, sample in rows:
                 # 跳过无效字段
                 if orig_name in ["-", "--------", "------:", "---:"] or orig_name.startswith("..."):
                     continue
@@ -182,14 +227,11 @@ class UnifiedDictionaryGenerator:
                 # 确定标准名称
                 final_canonical = self.get_canonical_name(orig_name)
                 
-                # 记录字段信息
-                field_occurrences[final_canonical].append({
-                    "original_name": orig_name,
-                    "english_name": eng_name,
-                    "interface": interface_name,
-                    "interface_type": interface_type,
-                    "parameter_type": param_type,
-                })
+                # 记录字段信息：出现次数、原始名称、英文名
+                field_occurrences[final_canonical] += 1
+                field_aliases[final_canonical].add(orig_name)
+                if eng_name:
+                    field_english_names[final_canonical].add(eng_name)
                 
                 # 标准化类型
                 normalized_type = self.type_mapping.get(field_type.lower(), field_type.lower())
@@ -199,63 +241,68 @@ class UnifiedDictionaryGenerator:
                 if interface_name:
                     field_interfaces[final_canonical].add(interface_name)
                 
-                # 记录数据样例
-                if sample and sample != "nan" and sample != "":
-                    field_samples[final_canonical].append(sample)
+                # 记录数据样例（去重，按首次出现顺序最多保留10个）
+                if sample and sample != "nan":
+                    samples = field_samples[final_canonical]
+                    if len(samples) < 10:
+                        samples[sample] = None
         
         # 构建统一字段字典
-        for canonical_name in field_occurrences.keys():
-            # 收集所有别名
-            aliases = set()
-            english_names = set()
-            for occ in field_occurrences[canonical_name]:
-                aliases.add(occ["original_name"])
-                if occ["english_name"]:
-                    english_names.add(occ["english_name"])
-            
+        for canonical_name, occurrence_count in field_occurrences.items():
             # 确定最常见的类型
             type_counter = field_types[canonical_name]
             most_common_type = type_counter.most_common(1)[0][0] if type_counter else "string"
             
-            # 收集数据样例（去重，最多保留10个）
-            unique_samples = list(set(field_samples[canonical_name]))[:10]
+            # 收集数据样例
+            unique_samples = list(field_samples[canonical_name])
             
             # 收集接口信息
             interfaces = list(field_interfaces[canonical_name])
             
             unified_dict["fields"][canonical_name] = {
                 "canonical_name": canonical_name,
-                "aliases": sorted(list(aliases - {canonical_name})),
-                "english_names": sorted(list(english_names)),
+                "aliases": sorted(field_aliases[canonical_name] - {canonical_name}),
+                "english_names": sorted(field_english_names[canonical_name]),
                 "common_type": most_common_type,
                 "all_types": dict(type_counter),
                 "sample_values": unique_samples,
                 "interfaces": interfaces,
-                "occurrence_count": len(field_occurrences[canonical_name]),
+                "occurrence_count": occurrence_count,
                 "interface_count": len(interfaces),
             }
         
         # 收集接口信息
         if "normalized" in dfs:
             df = dfs["normalized"]
-            for interface_name in df["接口名"].unique():
+            # 一次遍历按接口名分组行号（保持首次出现顺序），不再为每个接口过滤整张表
+            interface_rows = {}
+            for i, interface_name in enumerate(df["接口名"].tolist()):
                 if pd.notna(interface_name):
-                    interface_rows = df[df["接口名"] == interface_name]
-                    interface_type = interface_rows["接口类型"].iloc[0] if len(interface_rows) > 0 else ""
-                    
-                    unified_dict["interfaces"][interface_name] = {
-                        "name": interface_name,
-                        "type": interface_type,
-                        "fields": [
-                            {
-                                "name": str(row["参数名"]),
-                                "canonical_name": self.get_canonical_name(str(row["标准化参数名"]) if pd.notna(row["标准化参数名"]) else str(row["参数名"])),
-                                "type": self.type_mapping.get(str(row["类型"]).lower(), str(row["类型"]).lower()),
-                                "parameter_type": str(row["参数类型"]),
-                            }
-                            for _, row in interface_rows.iterrows()
-                        ]
-                    }
+                    interface_rows.setdefault(interface_name, []).append(i)
+            
+            names = [str(v) for v in df["参数名"].tolist()]
+            standard_names = [
+                str(v) if pd.notna(v) else name
+                for v, name in zip(df["标准化参数名"].tolist(), names)
+            ]
+            types = [str(v).lower() for v in df["类型"].tolist()]
+            param_types = [str(v) for v in df["参数类型"].tolist()]
+            interface_types = df["接口类型"].tolist()
+            
+            for interface_name, row_indexes in interface_rows.items():
+                unified_dict["interfaces"][interface_name] = {
+                    "name": interface_name,
+                    "type": interface_types[row_indexes[0]],
+                    "fields": [
+                        {
+                            "name": names[i],
+                            "canonical_name": self.get_canonical_name(standard_names[i]),
+                            "type": self.type_mapping.get(types[i], types[i]),
+                            "parameter_type": param_types[i],
+                        }
+                        for i in row_indexes
+                    ]
+                }
         
         # 添加统计信息
         unified_dict["statistics"] = {
@@ -279,8 +326,7 @@ class UnifiedDictionaryGenerator:
         """保存统一字典"""
         # 保存 JSON 格式
         json_path = os.path.join(self.output_dir, "unified_field_dictionary.json")
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(unified_dict, f, ensure_ascii=False, indent=2)
+        dump_json(unified_dict, json_path)
         print(f"✓ 统一字段字典已保存到: {json_path}")
         
         # 保存 CSV 格式的字段列表
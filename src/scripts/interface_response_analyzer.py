@@ -145,7 +145,7 @@ class InterfaceResponseAnalyzer:
             
             # 尝试匹配标准字段
             if not self.field_analysis[field]['standard_field']:
-                for standard_field, equivalents in self.field_mapper.field_equivalents.items():
+                for standard_field, equivalents in self.field_mapper.equivalent_sets.items():
                     if field in equivalents or field.lower() == standard_field.lower():
                         self.field_analysis[field]['standard_field'] = standard_field
                         break
@@ -11,12 +11,14 @@ import sys
 import unittest
 from typing import Dict, Any, List
 
+import pandas as pd
+
 # 添加src目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from unified_field_system import UnifiedFieldSystem
 from mappers.field_mapper import FieldMapper
-from formatters.field_formatter import FieldFormatter
+from formatters.field_formatter import FieldFormatter, InterfaceFieldConverter
 
 
 class TestUnifiedFieldSystem(unittest.TestCase):
@@ -176,7 +178,36 @@ class TestUnifiedFieldSystem(unittest.TestCase):
             result = self.field_formatter.normalize_float(input_value)
             print(f"数值标准化 '{input_value}' → '{result}'")
             self.assertEqual(result, expected)
-    
+
+    def test_column_conversion(self):
+        """测试整列转换与逐值转换一致"""
+        print("测试整列转换...")
+
+        converter = InterfaceFieldConverter("/nonexistent/field_mapping.json")
+        values = ['20240101', 1, None, 2.5, '2024年1月1日', ' 2024-1-2 ', True,
+                  'sz000001', '600000.SH', float('nan'), pd.Timestamp('2024-01-01')]
+        column = pd.Series(values, index=[3, 3, 1, 1, 0, 0, 5, 5, 7, 7, 9])
+
+        for field_name in ('date', 'symbol', 'date_code', 'code_close', 'name'):
+            result = converter.convert_column(field_name, column).tolist()
+            expected = [converter._convert_value(field_name, v) for v in column]
+            print(f"整列转换 '{field_name}' → {result}")
+            self.assertEqual(len(result), len(expected))
+            for got, exp in zip(result, expected):
+                if exp != exp:  # NaN
+                    self.assertNotEqual(got, got)
+                else:
+                    self.assertEqual((type(got), got), (type(exp), exp))
+
+        # 数值列中的None记为NaN
+        result = converter.convert_column('close', column).tolist()
+        expected = [converter._convert_value('close', v) for v in column]
+        for got, exp in zip(result, expected):
+            if exp is None or exp != exp:
+                self.assertNotEqual(got, got)
+            else:
+                self.assertEqual(got, exp)
+
     def test_integration(self):
         """测试集成功能"""
         print("测试集成功能...")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+通用工具函数
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用标准库json
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # 可选依赖，未安装时使用asyncio默认事件循环
+    uvloop = None
+
+# 支持的数据文件格式 -> 文件扩展名
+FILE_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'hdf5': '.h5',
+}
+
+# 更新频率 -> 已下载数据的有效期(秒)
+FREQUENCY_SECONDS = {
+    'daily': 86400,
+    'weekly': 7 * 86400,
+    'monthly': 30 * 86400,
+    'quarterly': 91 * 86400,
+    'yearly': 365 * 86400,
+}
+
+
+def is_fresh(path: str, frequency: str) -> bool:
+    """文件已存在且修改时间仍在更新频率窗口内"""
+    max_age = FREQUENCY_SECONDS.get(frequency)
+    if max_age is None:
+        return False
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return False
+    return time.time() - mtime < max_age
+
+
+def run_async(coro):
+    """运行协程直至完成，安装了uvloop时使用其事件循环"""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def load_json(path: str) -> Any:
+    """读取JSON文件，优先使用orjson"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=4)
+def _load_json_shared(path: str, mtime_ns: int, size: int) -> Any:
+    """以修改时间和大小为键缓存解析结果，文件未变化时共用同一份数据"""
+    return load_json(path)
+
+
+def load_json_cached(path: str) -> Optional[Any]:
+    """
+    读取JSON文件并缓存（如 complete_field_mapping.json）
+
+    同一文件未改动时只解析一次，各调用方共享返回的对象，不应修改其内容。
+
+    Returns:
+        解析后的数据，文件不存在时返回None
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _load_json_shared(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def dump_json(obj: Any, path: str, default: Optional[Callable[[Any], Any]] = None):
+    """以缩进格式写出JSON文件(UTF-8，不转义中文)，优先使用orjson
+
+    default用于转换无法直接序列化的对象（如 default=list 将集合写为数组）。
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2, default=default)
+
+
+def _dumps_indented(obj: Any, indent: str) -> bytes:
+    """序列化为缩进JSON，并将续行整体缩进indent"""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return data.replace(b'\n', b'\n' + indent.encode())
+
+
+def dump_json_records(header: dict, records_key: str, records: Iterable, path: str):
+    """流式写出 {**header, records_key: [...]} 形式的JSON报告
+
+    记录逐条序列化后直接写入文件，不在内存中拼出完整的报告对象。
+    """
+    with open(path, 'wb') as f:
+        f.write(b'{\n')
+        for key, value in header.items():
+            f.write(b'  ' + _dumps_indented(key, '') + b': ' + _dumps_indented(value, '  ') + b',\n')
+        f.write(b'  ' + _dumps_indented(records_key, '') + b': [')
+        first = True
+        for record in records:
+            f.write(b'\n    ' if first else b',\n    ')
+            f.write(_dumps_indented(record, '    '))
+            first = False
+        f.write(b']\n}' if first else b'\n  ]\n}')
+
+
+# 参数类型 -> 默认值生成函数
+PARAM_DEFAULTS = {
+    'string': lambda: "北京",
+    'int': lambda: 0,
+    'date': lambda: datetime.now().strftime('%Y%m%d'),
+}
+
+
+def build_default_params(func_params: dict) -> dict:
+    """按参数类型为接口参数填充默认值，未知类型的参数不传"""
+    return {
+        name: PARAM_DEFAULTS[param_type]()
+        for name, param_type in func_params.items()
+        if param_type in PARAM_DEFAULTS
+    }
+
+
+def write_dataframe(df: pd.DataFrame, path: str):
+    """按文件扩展名选择格式写出DataFrame"""
+    ext = os.path.splitext(path)[1]
+    if ext == '.parquet':
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+    elif ext == '.h5':
+        df.to_hdf(path, key='data', mode='w', format='table', complib='blosc')
+    else:
+        df.to_csv(path, index=False, chunksize=65536, lineterminator='\n')
+
+
+@lru_cache(maxsize=None)
+def resolve_ak_function(func_name: str) -> Callable:
+    """查找akshare函数并缓存，重试/重复任务不再重复查找"""
+    import akshare as ak
+
+    ak_func = getattr(ak, func_name, None)
+    if ak_func is None:
+        raise AttributeError(f"akshare中没有找到函数: {func_name}")
+    return ak_func
+
+
+@contextmanager
+def pooled_requests(pool_size: int = 10):
+    """在with块内让requests模块级的get/post复用连接，退出时恢复原函数
+
+    AKShare内部直接调用requests.get/requests.post，替换后同一线程的请求复用
+    TCP/TLS连接，避免每次请求重新握手。requests.Session不保证线程安全，
+    因此每个线程使用自己的Session，退出时统一关闭。
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    local = threading.local()
+    sessions = []
+    sessions_lock = threading.Lock()
+
+    def thread_session():
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            local.session = session
+            with sessions_lock:
+                sessions.append(session)
+        return session
+
+    def get(url, params=None, **kwargs):
+        return thread_session().get(url, params=params, **kwargs)
+
+    def post(url, data=None, json=None, **kwargs):
+        return thread_session().post(url, data=data, json=json, **kwargs)
+
+    original_get, original_post = requests.get, requests.post
+    requests.get = get
+    requests.post = post
+    try:
+        yield
+    finally:
+        requests.get = original_get
+        requests.post = original_post
+        for session in sessions:
+            session.close()